@@ -2,6 +2,7 @@ import asyncio
 import os
 import time
 from pathlib import Path
+from typing import Callable, Optional
 
 def _load_dotenv() -> None:
     """Load a local .env file if present (without overriding real env vars).
@@ -50,6 +51,7 @@ from utils.config import COMMAND_PREFIX
 from utils.db import Database
 from utils.guild_settings_store import GuildSettingsStore
 from utils.logger import get_logger, init_root_logging
+from utils.openai_client import close_async_client
 from utils.settings_store import VERSION, SettingsStore
 from utils.tts_pipeline import close_session
 
@@ -120,8 +122,23 @@ async def main() -> None:
         await bot.start(token)
     finally:
         await close_session()
+        await close_async_client()
+        try:
+            await bot.settings.flush()
+        except Exception as exc:
+            logger.warning("Failed to write settings on shutdown: %s", exc)
         await bot.db.close()
 
 
+def _loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    # Optional: uvloop speeds up the gateway and Web UI sockets when it is installed.
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+        runner.run(main())
@@ -1,12 +1,12 @@
 import contextlib
 import math
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from utils.config import ALL_VOICES, FALLBACK_VOICE, VOICE_ID_TO_NAME
+from utils.config import ALL_VOICE_IDS, ALL_VOICES, FALLBACK_VOICE, VOICE_ID_TO_NAME
 from utils.logger import get_logger
 
 logger = get_logger("admin")
@@ -16,7 +16,7 @@ def _settings_summary(settings: dict[str, Any]) -> str:
     fallback_voice = str(settings.get("fallback_voice", FALLBACK_VOICE))
 
     allowed = settings.get("allowed_voice_ids") or []
-    allowed_count = len(allowed) if isinstance(allowed, list) else 0
+    allowed_count = len(allowed) if isinstance(allowed, (list, tuple)) else 0
 
     return "\n".join(
         [
@@ -291,7 +291,7 @@ class VoiceSelectView(_AdminBaseView):
     def page_count(self) -> int:
         return max(1, math.ceil(len(ALL_VOICES) / self.per_page))
 
-    def _page_items(self) -> list[tuple[str, str]]:
+    def _page_items(self) -> Sequence[tuple[str, str]]:
         start = self.page * self.per_page
         end = start + self.per_page
         return ALL_VOICES[start:end]
@@ -424,7 +424,7 @@ class AllowedVoicesMenuView(_AdminBaseView):
 
     def render_content(self, *, error: Optional[str] = None) -> str:
         allowed = self.settings.get("allowed_voice_ids") or []
-        allowed_list = allowed if isinstance(allowed, list) else []
+        allowed_list = allowed if isinstance(allowed, (list, tuple)) else []
         allowed_set = set(str(v) for v in allowed_list if str(v).strip())
 
         req = self._required_voice_ids()
@@ -492,7 +492,7 @@ class AllowedVoicesMenuView(_AdminBaseView):
         await interaction.edit_original_response(content=view.render_content(), view=view)
 
     async def _on_allow_all(self, interaction: discord.Interaction) -> None:
-        all_ids = [voice_id for voice_id, _name in ALL_VOICES]
+        all_ids = list(ALL_VOICE_IDS)
         await self._save_allowed(interaction, all_ids)
 
     async def _on_clear(self, interaction: discord.Interaction) -> None:
@@ -539,12 +539,12 @@ class AllowedVoicesPickerView(_AdminBaseView):
         }
         return {v for v in req if v}
 
-    def _items(self) -> list[tuple[str, str]]:
+    def _items(self) -> Sequence[tuple[str, str]]:
         if self.mode == "add":
             return ALL_VOICES
 
         allowed = self.settings.get("allowed_voice_ids") or []
-        allowed_list = allowed if isinstance(allowed, list) else []
+        allowed_list = allowed if isinstance(allowed, (list, tuple)) else []
         allowed_set = {str(v).strip() for v in allowed_list if str(v).strip()}
 
         if self.settings.get("restrict_voices"):
@@ -559,7 +559,7 @@ class AllowedVoicesPickerView(_AdminBaseView):
     def page_count(self) -> int:
         return max(1, math.ceil(len(self._items()) / self.per_page))
 
-    def _page_items(self) -> list[tuple[str, str]]:
+    def _page_items(self) -> Sequence[tuple[str, str]]:
         items = self._items()
         start = self.page * self.per_page
         end = start + self.per_page
@@ -567,7 +567,7 @@ class AllowedVoicesPickerView(_AdminBaseView):
 
     def render_content(self, *, error: Optional[str] = None) -> str:
         allowed = self.settings.get("allowed_voice_ids") or []
-        allowed_list = allowed if isinstance(allowed, list) else []
+        allowed_list = allowed if isinstance(allowed, (list, tuple)) else []
         allowed_count = len({str(v).strip() for v in allowed_list if str(v).strip()})
 
         action = "Add" if self.mode == "add" else "Remove"
@@ -613,7 +613,7 @@ class AllowedVoicesPickerView(_AdminBaseView):
         await interaction.response.defer()
 
         current_allowed = self.settings.get("allowed_voice_ids") or []
-        allowed_list = current_allowed if isinstance(current_allowed, list) else []
+        allowed_list = current_allowed if isinstance(current_allowed, (list, tuple)) else []
         allowed_set = {str(v).strip() for v in allowed_list if str(v).strip()}
 
         selected = {str(v).strip() for v in selected_ids if str(v).strip()}
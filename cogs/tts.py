@@ -28,6 +28,7 @@ from utils.config import (
     STUCK_SECONDS,
     USER_COOLDOWN_SECONDS,
     VOICE_ID_TO_NAME,
+    VOICE_SEARCH_KEYS,
 )
 from utils.logger import get_logger
 from utils.tts_pipeline import close_session, get_tts_stream
@@ -321,31 +322,33 @@ class TTSCog(commands.Cog):
         old_default = self._default_voice_by_guild.get(guild_id)
         replacement = self._user_default_voice(settings)
 
-        async def migrate_voice(voice_id: Optional[str]) -> None:
-            if not voice_id:
-                return
+        if old_default != new_default:
+            voice_ids = [vid for vid in (old_default, new_default) if vid]
+        elif old_default is None:
+            voice_ids = [new_default] if new_default else []
+        else:
+            voice_ids = []
+
+        if voice_ids:
             db = getattr(self.bot, "db", None)
             if db is not None:
                 try:
-                    await db.replace_user_voice(voice_id, replacement, int(time.time()))
+                    await db.replace_user_voices(
+                        [(vid, replacement) for vid in voice_ids],
+                        int(time.time()),
+                    )
                 except Exception as exc:
                     logger.warning(
                         "Failed to migrate user voices: old=%s new=%s err=%s",
-                        voice_id,
+                        ",".join(voice_ids),
                         replacement,
                         exc,
                     )
+            migrated = set(voice_ids)
             for uid, vid in list(self.user_voice_cache.items()):
-                if vid == voice_id:
+                if vid in migrated:
                     self.user_voice_cache[uid] = replacement
 
-        if old_default != new_default:
-            if old_default:
-                await migrate_voice(old_default)
-            await migrate_voice(new_default)
-        elif old_default is None:
-            await migrate_voice(new_default)
-
         self._default_voice_by_guild[guild_id] = new_default
 
     def _allowed_voice_ids(self, settings: dict) -> Optional[set[str]]:
@@ -409,7 +412,7 @@ class TTSCog(commands.Cog):
         if allowed is None:
             return [(vid, name) for vid, name in ALL_VOICES if vid not in excluded]
         allowed_list = settings.get("allowed_voice_ids") or []
-        if not isinstance(allowed_list, list):
+        if not isinstance(allowed_list, (list, tuple)):
             allowed_list = list(allowed)
 
         items: list[tuple[str, str]] = [
@@ -660,28 +663,29 @@ class TTSCog(commands.Cog):
             done.set()
             raise RuntimeError(f"voice_client.play failed: {exc}") from exc
 
-        logger.info(
-            "Playback start: guild=%s channel=%s len=%s voice=%s",
-            guild_id,
-            getattr(getattr(voice_client, "channel", None), "id", None),
-            len(clean_text),
-            voice_id,
-        )
-        ok = await wait_for_playback(done, timeout=MAX_AUDIO_SECONDS)
-        if not ok:
-            logger.warning(
-                "Playback timeout: guild=%s channel=%s len=%s voice=%s",
+        try:
+            logger.info(
+                "Playback start: guild=%s channel=%s len=%s voice=%s",
                 guild_id,
                 getattr(getattr(voice_client, "channel", None), "id", None),
                 len(clean_text),
                 voice_id,
             )
-            try:
-                voice_client.stop()
-            except Exception:
-                pass
-            await self._recover_voice(guild_id, reason="playback_timeout")
-            raise RuntimeError("playback timeout")
+            ok = await wait_for_playback(done, timeout=MAX_AUDIO_SECONDS)
+            if not ok:
+                logger.warning(
+                    "Playback timeout: guild=%s channel=%s len=%s voice=%s",
+                    guild_id,
+                    getattr(getattr(voice_client, "channel", None), "id", None),
+                    len(clean_text),
+                    voice_id,
+                )
+                try:
+                    voice_client.stop()
+                except Exception:
+                    pass
+                await self._recover_voice(guild_id, reason="playback_timeout")
+                raise RuntimeError("playback timeout")
         finally:
             duration = max(0.0, time.monotonic() - start_ts)
             logger.info(
@@ -1434,10 +1438,9 @@ class TTSCog(commands.Cog):
 
             return choices
 
-        for vid, name in VOICE_ID_TO_NAME.items():
+        for vid, hay in VOICE_SEARCH_KEYS:
             if not is_allowed(vid):
                 continue
-            hay = f"{vid} {name}".lower()
             if current in hay:
                 choices.append(mk_choice(vid))
                 if len(choices) >= 25:
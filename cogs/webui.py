@@ -1,26 +1,77 @@
 import asyncio
+import base64
 import contextlib
+import functools
+import gzip
+import hashlib
+import hmac
 import json
+import logging
 import os
+import string
 import time
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import discord
 from aiohttp import web
-from discord.ext import commands
-
-from utils.config import ALL_VOICE_IDS, ALL_VOICES, FALLBACK_VOICE, VOICE_ID_TO_NAME
+from aiohttp.abc import AbstractAccessLogger
+from discord.ext import commands, tasks
+
+from cogs.tts import QueueItem
+from utils.config import (
+    ALL_VOICE_IDS_SET,
+    ALL_VOICES,
+    DJ_BATCH_MAX,
+    DJ_BATCH_WINDOW_MS,
+    FALLBACK_VOICE,
+    TRUTHY_STRINGS,
+    VOICE_ID_TO_NAME,
+)
 from utils.logger import get_logger
+from utils.open_ai import (
+    dj_intro_async,
+    dj_intro_fallback,
+    dj_intro_many_async,
+    song_suggestions_async,
+)
+from utils.openai_client import close_async_client
 from utils.settings_store import VERSION
-from utils.tts_pipeline import get_tts_stream
+from utils.tts_pipeline import get_tts_stream_async
+
+try:  # Installed with aiohttp[speedups].
+    import brotli
+except ImportError:
+    brotli = None
+
+try:  # Optional: orjson encodes and parses API bodies several times faster.
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = get_logger("webui")
 
+SETTINGS_CACHE_MAX = 128
+TTS_SETTINGS_TTL = 10.0
+DJ_INTRO_CACHE_TTL = 5.0
+MAX_BODY_BYTES = 32 * 1024
+LOG_TAIL_DEFAULT = 500
+SSE_HEARTBEAT_SECONDS = 15.0
+
 
 def _truthy(value: Optional[str], default: bool = True) -> bool:
     if value is None:
         return default
-    return value.strip().lower() in {"1", "true", "yes", "y", "on"}
+    value = value.strip()
+    # Env values are usually already lowercase; skip the copy when they are.
+    return (value if value.islower() else value.lower()) in TRUTHY_STRINGS
+
+
+# Read once at import; bot.py loads .env before any cog is imported.
+WEB_UI_ENABLED = _truthy(os.getenv("WEB_UI_ENABLED"), default=True)
+WEB_HOST = os.getenv("WEB_HOST") or "127.0.0.1"
+WEB_PORT = int(os.getenv("WEB_PORT") or "8080")
+WEB_UI_TOKEN = (os.getenv("WEB_UI_TOKEN") or "").strip() or None
 
 
 def _get_bearer_token(request: web.Request) -> Optional[str]:
@@ -30,27 +81,413 @@ def _get_bearer_token(request: web.Request) -> Optional[str]:
     return request.query.get("token")
 
 
-def _sse_encode(data: str) -> bytes:
+def _token_matches(provided: Optional[str], expected: bytes) -> bool:
+    # Constant-time compare so response timing doesn't leak the token prefix.
+    return provided is not None and hmac.compare_digest(provided.encode("utf-8"), expected)
+
+
+@web.middleware
+async def _size_limit_middleware(request: web.Request, handler):
+    # Reject declared oversized bodies before any handler starts reading them;
+    # client_max_size still caps chunked uploads.
+    length = request.content_length
+    if length is not None and length > MAX_BODY_BYTES:
+        raise web.HTTPRequestEntityTooLarge(max_size=MAX_BODY_BYTES, actual_size=length)
+    return await handler(request)
+
+
+def _connected_to(state: Any, channel: discord.abc.GuildChannel) -> bool:
+    """True if the guild's voice client is already live in `channel` (skips ensure_connected)."""
+    vc = state.voice_client
+    return bool(vc and vc.is_connected() and vc.channel and vc.channel.id == channel.id)
+
+
+_AUTH_EXEMPT_PATHS = frozenset(
+    {
+        "/api/logs",
+        "/api/logs/stream",
+        "/api/status",
+        "/api/status/live",
+        "/api/status/meta",
+        "/api/guilds",
+        "/api/voices",
+        "/api/voices/preview",
+        "/api/settings",
+        "/api/tts",  # Allow TTS requests without auth for testing
+        "/api/radio-presenter",  # Allow settings access without auth for testing
+        "/api/song-suggestions",
+    }
+)
+
+
+def _make_auth_middleware(expected: bytes):
+    """Bearer-token check for /api/ routes; only installed when WEB_UI_TOKEN is set."""
+    exempt = _AUTH_EXEMPT_PATHS
+    get_token = _get_bearer_token
+    matches = _token_matches
+
+    @web.middleware
+    async def auth_middleware(request: web.Request, handler):
+        path = request.path
+        if path[:5] == "/api/" and path not in exempt and not matches(get_token(request), expected):
+            return _json_response({"error": "unauthorized"}, status=401)
+        return await handler(request)
+
+    return auth_middleware
+
+
+def _str_field(raw: Any) -> str:
+    """Stripped string value of a JSON body field; falsy values become ""."""
+    if isinstance(raw, str):
+        return raw.strip()
+    return str(raw).strip() if raw else ""
+
+
+def _parse_id(raw: Any) -> Optional[int]:
+    """Parse a Discord snowflake from a query/JSON value; None if it isn't one."""
+    s = (raw if isinstance(raw, str) else str(raw)).strip()
+    return int(s) if s.isascii() and s.isdigit() else None
+
+
+async def _read_json_object(request: web.Request) -> Dict[str, Any]:
+    # Parse the raw bytes directly; request.json() would decode to str and check Content-Type first.
+    try:
+        payload = _json_loads(await request.read())
+    except ValueError:
+        raise web.HTTPBadRequest(text="Invalid JSON")
+    if not isinstance(payload, dict):
+        raise web.HTTPBadRequest(text="JSON body must be an object")
+    return payload
+
+
+def _tail_param(request: web.Request) -> int:
+    # The dashboards never send `tail`, so the absent case skips parsing entirely.
+    raw = request.rel_url.query.get("tail")
+    if not raw:
+        return LOG_TAIL_DEFAULT
+    try:
+        return int(raw)
+    except ValueError:
+        raise web.HTTPBadRequest(text="tail must be an integer")
+
+
+_SSE_HEADERS = {
+    "Content-Type": "text/event-stream",
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Stop nginx from buffering the stream.
+    "X-Accel-Buffering": "no",
+}
+_SSE_HEARTBEAT = b": ping\n\n"
+
+
+def _sse_frame(data: str) -> str:
     # SSE frames require each line to be prefixed with `data:`.
+    if "\n" not in data and "\r" not in data:
+        return "data: " + data + "\n\n"
     lines = data.splitlines() or [""]
-    payload = "".join([f"data: {line}\n" for line in lines])
-    payload += "\n"
-    return payload.encode("utf-8")
+    return "".join([f"data: {line}\n" for line in lines]) + "\n"
 
 
-def _layout(title: str, body_html: str, *, token_required: bool) -> str:
-    token_banner = (
-        "<div class=\"pill warn\">API token required</div>" if token_required else "<div class=\"pill ok\">No API token</div>"
+def _sse_encode(lines: List[str]) -> bytes:
+    # Frame every line as text and encode once, so a batch is a single write.
+    return "".join([_sse_frame(line) for line in lines]).encode("utf-8")
+
+
+def _json_dumps(data: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _json_bytes(data: Any) -> bytes:
+    # Response bodies go out as bytes; orjson produces them without a str round-trip.
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(raw: Any) -> Any:
+    # Both parsers accept bytes; their decode errors are ValueErrors.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_response(data: Any, *, status: int = 200) -> web.Response:
+    return web.Response(
+        body=_json_bytes(data),
+        status=status,
+        content_type="application/json",
+        charset="utf-8",
     )
 
-    return f"""<!doctype html>
+
+def _voice_list() -> list[Dict[str, str]]:
+    return [{"id": voice_id, "name": name} for voice_id, name in ALL_VOICES]
+
+
+# ALL_VOICES is fixed at import time, so /api/voices is served from these bytes.
+_VOICES_JSON_BYTES = _json_bytes({"voices": _voice_list()})
+
+
+def _boot_script(data: Dict[str, Any]) -> str:
+    # Escape `</` so the payload can't close the script element early.
+    payload = _json_dumps(data).replace("</", "<\\/")
+    return f'<script id="__boot" type="application/json">{payload}</script>'
+
+
+def _page_etag(body: bytes) -> str:
+    # Weak: the gzip, brotli and identity encodings of a page share one validator.
+    return 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def _etag_matches(request: web.Request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header == etag:
+        return True
+    # If-None-Match uses weak comparison and may list several tags.
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") in (opaque, "*") for tag in header.split(","))
+
+
+def _encode_page(html: str) -> Tuple[bytes, str, bytes, Optional[bytes]]:
+    # Static pages never change after startup, so compress them once here.
+    body = html.encode("utf-8")
+    etag = _page_etag(body)
+    br = brotli.compress(body, quality=5) if brotli is not None else None
+    return body, etag, gzip.compress(body, 6), br
+
+
+def _split_page(html: str) -> Tuple[bytes, bytes]:
+    head, sep, tail = html.rpartition("</body>")
+    return head.encode("utf-8"), ("\n" + sep + tail).encode("utf-8")
+
+
+class _AccessLogger(AbstractAccessLogger):
+    """One preformatted DEBUG line per request; dashboards poll several endpoints a second."""
+
+    @property
+    def enabled(self) -> bool:
+        # aiohttp skips the call entirely when this is False (3.10+).
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def log(self, request: web.BaseRequest, response: web.StreamResponse, time: float) -> None:
+        self.logger.debug(
+            "%s %s %s %d %.1fms", request.remote, request.method, request.path, response.status, time * 1000
+        )
+
+
+class _DJBatcher:
+    """Collects DJ intro requests arriving within a short window into one OpenAI call."""
+
+    def __init__(self, *, window_ms: int, max_batch: int) -> None:
+        self.window = max(0, window_ms) / 1000
+        self.max_batch = max(1, max_batch)
+        self._queue: "asyncio.Queue[Tuple[Dict[str, Optional[str]], asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop batching; queued and in-flight requests fail instead of waiting forever."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        while not self._queue.empty():
+            _, fut = self._queue.get_nowait()
+            if not fut.done():
+                fut.set_exception(RuntimeError("DJ intro batcher stopped"))
+        inflight = list(self._inflight)
+        for task in inflight:
+            task.cancel()
+        await asyncio.gather(*inflight, return_exceptions=True)
+
+    async def submit(self, **params: Optional[str]) -> Tuple[str, str, bool]:
+        """Returns `(intro, raw, used_fallback)` like `dj_intro_async(..., return_debug=True)`."""
+        if self._task is None:
+            return await dj_intro_async(**params, return_debug=True)
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((params, fut))
+        return await fut
+
+    @staticmethod
+    def _fail(batch: list[Tuple[Dict[str, Optional[str]], asyncio.Future]], exc: BaseException) -> None:
+        for _, fut in batch:
+            if not fut.done():
+                fut.set_exception(exc)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            try:
+                while len(batch) < self.max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Stopped mid-window: the requests collected so far are not queued any more.
+                self._fail(batch, RuntimeError("DJ intro batcher stopped"))
+                raise
+            # Resolve in the background so the next window starts collecting immediately.
+            task = asyncio.create_task(self._resolve(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _resolve(self, batch: list[Tuple[Dict[str, Optional[str]], asyncio.Future]]) -> None:
+        try:
+            results = await dj_intro_many_async([params for params, _ in batch])
+        except asyncio.CancelledError:
+            self._fail(batch, RuntimeError("DJ intro batcher stopped"))
+            raise
+        except Exception as exc:
+            self._fail(batch, exc)
+            return
+        if len(batch) > 1:
+            logger.debug("Generated %d DJ intros in one request", len(batch))
+        for (_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+
+# Helpers shared by every page. Served as a cacheable external file so the
+# HTML can be parsed without waiting on it; page scripts are modules, which
+# run after deferred scripts in document order.
+_WEBUI_JS = """
+function getToken() {
+  return localStorage.getItem('web_token') || '';
+}
+
+const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+
+function escapeHtml(value) {
+  return String(value == null ? '' : value).replace(/[&<>"']/g, (ch) => HTML_ESCAPES[ch]);
+}
+
+const escapeAttr = escapeHtml;
+
+function optionsHtml(items, label) {
+  return items.map(it => `<option value="${escapeAttr(it.id)}">${escapeHtml(label(it))}</option>`).join('');
+}
+
+const POST_HEADERS = Object.freeze({ 'Content-Type': 'application/json' });
+
+// POST a JSON body. Pass a string to send an already-serialized payload as-is.
+async function postJson(url, payload) {
+  const body = typeof payload === 'string' ? payload : JSON.stringify(payload);
+  return apiFetch(url, { method: 'POST', headers: POST_HEADERS, body });
+}
+
+// sessionStorage-backed GET cache. Fresh entries are returned as-is; stale
+// ones are returned immediately while a refetch runs in the background and
+// announces the new value via a 'webui:cache-refresh' window event.
+async function cachedFetch(url, ttlMs) {
+  const key = 'webui-cache:' + url;
+  let hit = null;
+  try {
+    hit = JSON.parse(sessionStorage.getItem(key) || 'null');
+  } catch (e) {}
+
+  if (hit && Date.now() - hit.t < ttlMs) return hit.v;
+
+  const fresh = apiFetch(url).then((value) => {
+    try {
+      sessionStorage.setItem(key, JSON.stringify({ t: Date.now(), v: value }));
+    } catch (e) {}
+    return value;
+  });
+  if (!hit) return await fresh;
+
+  fresh
+    .then((value) => window.dispatchEvent(new CustomEvent('webui:cache-refresh', { detail: { url, value } })))
+    .catch(() => {});
+  return hit.v;
+}
+
+// Initial data the server rendered into the page, if any.
+function readBoot() {
+  const el = document.getElementById('__boot');
+  if (!el) return null;
+  try {
+    return JSON.parse(el.textContent);
+  } catch (e) {
+    return null;
+  }
+}
+
+function debounce(fn, ms) {
+  let timer = null;
+  return (...args) => {
+    clearTimeout(timer);
+    timer = setTimeout(() => fn(...args), ms);
+  };
+}
+
+function buildAuthHeaders(t) {
+  return Object.freeze(t ? { 'Authorization': 'Bearer ' + t } : {});
+}
+
+// Rebuilt only when the token changes (here or in another tab).
+let AUTH_HEADERS = buildAuthHeaders(getToken());
+
+window.addEventListener('storage', (ev) => {
+  if (ev.key === 'web_token' || ev.key === null) AUTH_HEADERS = buildAuthHeaders(getToken());
+});
+
+function setToken(v) {
+  localStorage.setItem('web_token', v || '');
+  AUTH_HEADERS = buildAuthHeaders(v || '');
+}
+
+function authHeaders() {
+  return AUTH_HEADERS;
+}
+
+async function apiFetch(url, opts) {
+  const options = opts || {};
+  options.headers = Object.assign({}, options.headers || {}, authHeaders());
+  const res = await fetch(url, options);
+  const ct = res.headers.get('content-type') || '';
+  if (!res.ok) {
+    let msg = res.status + ' ' + res.statusText;
+    try {
+      if (ct.includes('application/json')) {
+        const j = await res.json();
+        if (j && j.error) msg = j.error;
+      } else {
+        msg = await res.text();
+      }
+    } catch (e) {}
+    throw new Error(msg);
+  }
+  if (ct.includes('application/json')) return await res.json();
+  return await res.text();
+}
+"""
+_WEBUI_JS_BYTES = _WEBUI_JS.encode("utf-8")
+_WEBUI_JS_SRI = "sha384-" + base64.b64encode(hashlib.sha384(_WEBUI_JS_BYTES).digest()).decode("ascii")
+_WEBUI_JS_VERSION = hashlib.blake2b(_WEBUI_JS_BYTES, digest_size=6).hexdigest()
+
+
+_LAYOUT_TEMPLATE = string.Template("""<!doctype html>
 <html lang=\"en\">
 <head>
   <meta charset=\"utf-8\" />
   <meta name=\"viewport\" content=\"width=device-width,initial-scale=1\" />
-  <title>{title}</title>
+  <title>$title</title>
   <style>
-    :root {{
+    :root {
       --bg0: #0b1020;
       --bg1: #101a33;
       --card: rgba(255,255,255,0.06);
@@ -63,9 +500,9 @@ def _layout(title: str, body_html: str, *, token_required: bool) -> str:
       --warn: #ffcc66;
       --mono: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, \"Liberation Mono\", \"Courier New\", monospace;
       --sans: ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, \"Apple Color Emoji\", \"Segoe UI Emoji\";
-    }}
+    }
 
-    body {{
+    body {
       margin: 0;
       font-family: var(--sans);
       color: var(--text);
@@ -75,35 +512,35 @@ def _layout(title: str, body_html: str, *, token_required: bool) -> str:
         radial-gradient(800px 800px at 50% 100%, rgba(255,93,108,0.10), transparent 55%),
         linear-gradient(160deg, var(--bg0), var(--bg1));
       min-height: 100vh;
-    }}
+    }
 
-    .wrap {{ max-width: 980px; margin: 0 auto; padding: 28px 18px 56px; }}
+    .wrap { max-width: 980px; margin: 0 auto; padding: 28px 18px 56px; }
 
-    header {{
+    header {
       display: flex;
       align-items: center;
       justify-content: space-between;
       gap: 12px;
       margin-bottom: 18px;
-    }}
+    }
 
-    .brand {{
+    .brand {
       display: flex;
       flex-direction: column;
       gap: 2px;
-    }}
+    }
 
-    .brand h1 {{
+    .brand h1 {
       margin: 0;
       font-size: 20px;
       letter-spacing: 0.2px;
-    }}
+    }
 
-    .brand small {{ color: var(--muted); }}
+    .brand small { color: var(--muted); }
 
-    nav {{ display: flex; gap: 10px; align-items: center; flex-wrap: wrap; justify-content: flex-end; }}
+    nav { display: flex; gap: 10px; align-items: center; flex-wrap: wrap; justify-content: flex-end; }
 
-    a.btn, button.btn {{
+    a.btn, button.btn {
       appearance: none;
       border: 1px solid rgba(255,255,255,0.10);
       background: rgba(255,255,255,0.04);
@@ -113,43 +550,43 @@ def _layout(title: str, body_html: str, *, token_required: bool) -> str:
       text-decoration: none;
       cursor: pointer;
       transition: transform 120ms ease, background 120ms ease, border 120ms ease;
-    }}
+    }
 
-    a.btn:hover, button.btn:hover {{
+    a.btn:hover, button.btn:hover {
       background: rgba(255,255,255,0.07);
       border-color: rgba(255,255,255,0.18);
       transform: translateY(-1px);
-    }}
+    }
 
-    .pill {{
+    .pill {
       font-size: 12px;
       border-radius: 999px;
       padding: 6px 10px;
       border: 1px solid rgba(255,255,255,0.10);
       background: rgba(255,255,255,0.04);
       color: var(--muted);
-    }}
+    }
 
-    .pill.ok {{ border-color: rgba(123,255,178,0.22); color: rgba(123,255,178,0.85); background: rgba(123,255,178,0.08); }}
-    .pill.warn {{ border-color: rgba(255,204,102,0.22); color: rgba(255,204,102,0.90); background: rgba(255,204,102,0.08); }}
+    .pill.ok { border-color: rgba(123,255,178,0.22); color: rgba(123,255,178,0.85); background: rgba(123,255,178,0.08); }
+    .pill.warn { border-color: rgba(255,204,102,0.22); color: rgba(255,204,102,0.90); background: rgba(255,204,102,0.08); }
 
-    .card {{
+    .card {
       background: var(--card);
       border: 1px solid rgba(255,255,255,0.10);
       border-radius: 18px;
       padding: 16px;
       box-shadow: 0 18px 55px rgba(0,0,0,0.28);
-    }}
+    }
 
-    .grid {{ display: grid; grid-template-columns: 1fr; gap: 14px; }}
-    @media (min-width: 860px) {{ .grid.two {{ grid-template-columns: 1.1fr 0.9fr; }} }}
+    .grid { display: grid; grid-template-columns: 1fr; gap: 14px; }
+    @media (min-width: 860px) { .grid.two { grid-template-columns: 1.1fr 0.9fr; } }
 
-    .kv {{ display: grid; grid-template-columns: 180px 1fr; gap: 8px 12px; }}
-    .kv div {{ color: var(--muted); }}
-    .kv code {{ font-family: var(--mono); color: var(--text); }}
+    .kv { display: grid; grid-template-columns: 180px 1fr; gap: 8px 12px; }
+    .kv div { color: var(--muted); }
+    .kv code { font-family: var(--mono); color: var(--text); }
 
-    .inputrow {{ display: flex; gap: 10px; align-items: center; flex-wrap: wrap; }}
-    input[type=text], input[type=number], select {{
+    .inputrow { display: flex; gap: 10px; align-items: center; flex-wrap: wrap; }
+    input[type=text], input[type=number], select {
       background: rgba(0,0,0,0.28);
       color: var(--text);
       border: 1px solid rgba(255,255,255,0.10);
@@ -157,9 +594,9 @@ def _layout(title: str, body_html: str, *, token_required: bool) -> str:
       padding: 10px 12px;
       min-width: 240px;
       outline: none;
-    }}
+    }
 
-    textarea {{
+    textarea {
       width: 100%;
       box-sizing: border-box;
       background: rgba(0,0,0,0.28);
@@ -173,13 +610,13 @@ def _layout(title: str, body_html: str, *, token_required: bool) -> str:
       line-height: 1.45;
       min-height: 220px;
       resize: vertical;
-    }}
+    }
 
-    textarea:focus {{ border-color: rgba(69,208,255,0.35); box-shadow: 0 0 0 3px rgba(69,208,255,0.12); }}
+    textarea:focus { border-color: rgba(69,208,255,0.35); box-shadow: 0 0 0 3px rgba(69,208,255,0.12); }
 
-    input[type=text]:focus, input[type=number]:focus, select:focus {{ border-color: rgba(69,208,255,0.35); box-shadow: 0 0 0 3px rgba(69,208,255,0.12); }}
+    input[type=text]:focus, input[type=number]:focus, select:focus { border-color: rgba(69,208,255,0.35); box-shadow: 0 0 0 3px rgba(69,208,255,0.12); }
 
-    pre.log {{
+    pre.log {
       margin: 0;
       font-family: var(--mono);
       font-size: 12px;
@@ -193,14 +630,14 @@ def _layout(title: str, body_html: str, *, token_required: bool) -> str:
       max-height: 70vh;
       white-space: pre-wrap;
       word-break: break-word;
-    }}
+    }
 
-    .danger {{ color: var(--danger); }}
-    .muted {{ color: var(--muted); }}
+    .danger { color: var(--danger); }
+    .muted { color: var(--muted); }
 
-    .btn.small {{ padding: 6px 10px; border-radius: 10px; font-size: 12px; }}
+    .btn.small { padding: 6px 10px; border-radius: 10px; font-size: 12px; }
 
-    .voice-list {{
+    .voice-list {
       display: grid;
       grid-template-columns: 1fr;
       gap: 8px;
@@ -210,9 +647,9 @@ def _layout(title: str, body_html: str, *, token_required: bool) -> str:
       background: rgba(0,0,0,0.18);
       border: 1px solid rgba(255,255,255,0.10);
       border-radius: 14px;
-    }}
+    }
 
-    .voice-row {{
+    .voice-row {
       display: flex;
       align-items: center;
       justify-content: space-between;
@@ -221,52 +658,16 @@ def _layout(title: str, body_html: str, *, token_required: bool) -> str:
       border-radius: 12px;
       background: rgba(255,255,255,0.03);
       border: 1px solid rgba(255,255,255,0.06);
-    }}
+    }
 
-    .voice-row:hover {{ background: rgba(255,255,255,0.05); border-color: rgba(255,255,255,0.10); }}
-    .voice-meta {{ display: flex; align-items: center; gap: 10px; min-width: 0; }}
-    .voice-meta input[type=checkbox] {{ transform: translateY(1px); }}
-    .voice-name {{ font-size: 13px; color: rgba(255,255,255,0.92); }}
-    .voice-id {{ font-family: var(--mono); font-size: 12px; color: var(--muted); }}
+    .voice-row:hover { background: rgba(255,255,255,0.05); border-color: rgba(255,255,255,0.10); }
+    .voice-meta { display: flex; align-items: center; gap: 10px; min-width: 0; }
+    .voice-meta input[type=checkbox] { transform: translateY(1px); }
+    .voice-name { font-size: 13px; color: rgba(255,255,255,0.92); }
+    .voice-id { font-family: var(--mono); font-size: 12px; color: var(--muted); }
   </style>
-  <script>
-    window.__TOKEN_REQUIRED__ = {str(token_required).lower()};
-
-    function getToken() {{
-      return localStorage.getItem('web_token') || '';
-    }}
-
-    function setToken(v) {{
-      localStorage.setItem('web_token', v || '');
-    }}
-
-    function authHeaders() {{
-      const t = getToken();
-      if (!t) return {{}};
-      return {{ 'Authorization': 'Bearer ' + t }};
-    }}
-
-    async function apiFetch(url, opts) {{
-      const options = opts || {{}};
-      options.headers = Object.assign({{}}, options.headers || {{}}, authHeaders());
-      const res = await fetch(url, options);
-      const ct = res.headers.get('content-type') || '';
-      if (!res.ok) {{
-        let msg = res.status + ' ' + res.statusText;
-        try {{
-          if (ct.includes('application/json')) {{
-            const j = await res.json();
-            if (j && j.error) msg = j.error;
-          }} else {{
-            msg = await res.text();
-          }}
-        }} catch (e) {{}}
-        throw new Error(msg);
-      }}
-      if (ct.includes('application/json')) return await res.json();
-      return await res.text();
-    }}
-  </script>
+  <script>window.__TOKEN_REQUIRED__ = $token_required;</script>
+  <script defer src="/static/webui.js?v=$webui_js_version" integrity="$webui_js_sri"></script>
 </head>
 <body>
   <div class=\"wrap\">
@@ -280,16 +681,32 @@ def _layout(title: str, body_html: str, *, token_required: bool) -> str:
         <a class=\"btn\" href=\"/logs\">Logs</a>
         <a class=\"btn\" href=\"/settings\">Settings</a>
         <a class=\"btn\" href=\"/test-voices\">Test Voices</a>
-        {token_banner}
+        $token_banner
       </nav>
     </header>
 
-    {body_html}
+    $body_html
   </div>
 </body>
-</html>"""
+</html>""")
+
+
+def _layout(title: str, body_html: str, *, token_required: bool) -> str:
+    token_banner = (
+        "<div class=\"pill warn\">API token required</div>" if token_required else "<div class=\"pill ok\">No API token</div>"
+    )
+
+    return _LAYOUT_TEMPLATE.substitute(
+        title=title,
+        body_html=body_html,
+        token_banner=token_banner,
+        token_required="true" if token_required else "false",
+        webui_js_version=_WEBUI_JS_VERSION,
+        webui_js_sri=_WEBUI_JS_SRI,
+    )
 
 
+@functools.cache
 def _index_body() -> str:
     return """
 <div class="grid two">
@@ -331,7 +748,7 @@ def _index_body() -> str:
   </div>
 </div>
 
-<script>
+<script type="module">
   const tokenInput = document.getElementById('tokenInput');
   const tokenMsg = document.getElementById('tokenMsg');
   const tokenStatePill = document.getElementById('tokenStatePill');
@@ -361,13 +778,13 @@ def _index_body() -> str:
 
   document.getElementById('saveToken').addEventListener('click', () => {
     const v = (tokenInput.value || '').trim();
-    localStorage.setItem('web_token', v);
+    setToken(v);
     tokenMsg.textContent = v ? 'Saved.' : 'Cleared.';
     updateTokenUi();
   });
 
   document.getElementById('clearToken').addEventListener('click', () => {
-    localStorage.removeItem('web_token');
+    setToken('');
     tokenInput.value = '';
     tokenMsg.textContent = 'Cleared.';
     updateTokenUi();
@@ -395,7 +812,8 @@ def _index_body() -> str:
   (async () => {
     const kv = document.getElementById('statusKv');
     try {
-      const s = await apiFetch('/api/status');
+      const [live, meta] = await Promise.all([apiFetch('/api/status/live'), apiFetch('/api/status/meta')]);
+      const s = Object.assign({}, meta, live);
       kv.innerHTML = `
         <div>Bot</div><code>${(s.user || 'not connected')}</code>
         <div>Version</div><code>${(s.tts_version || 'unknown')}</code>
@@ -412,6 +830,7 @@ def _index_body() -> str:
 """
 
 
+@functools.cache
 def _logs_body(token_required: bool) -> str:
     token_hint = (
         "<span class=\"pill warn\" id=\"tokenStreamPill\">Token required</span>"
@@ -433,7 +852,7 @@ def _logs_body(token_required: bool) -> str:
   <pre class="log" id="logBox">Connecting…</pre>
 </div>
 
-<script>
+<script type="module">
   const logBox = document.getElementById('logBox');
   const pauseBtn = document.getElementById('pauseBtn');
   const clearBtn = document.getElementById('clearBtn');
@@ -442,6 +861,24 @@ def _logs_body(token_required: bool) -> str:
   let paused = false;
   let es = null;
   let streamTail = 0;
+  let retryDelay = 1000;
+
+  // One EventSource per browser: the tab holding the lock streams and relays
+  // lines to the other log tabs over a BroadcastChannel.
+  const logChannel = (window.BroadcastChannel && navigator.locks) ? new BroadcastChannel('webui-logs') : null;
+  let isStreamLeader = false;
+
+  if (logChannel) {
+    logChannel.onmessage = (ev) => {
+      if (isStreamLeader || paused) return;
+      appendLine(ev.data);
+    };
+  }
+
+  function relayLine(text) {
+    if (logChannel) logChannel.postMessage(text);
+    if (!paused) appendLine(text);
+  }
 
   function setTokenPill(ok, text) {
     if (!tokenStreamPill) return;
@@ -473,31 +910,43 @@ def _logs_body(token_required: bool) -> str:
     if (es) es.close();
     es = new EventSource(url);
 
+    es.onopen = () => {
+      retryDelay = 1000;
+    };
+
     es.onmessage = (ev) => {
-      if (paused) return;
       streamTail = 0;
-      appendLine(ev.data);
+      relayLine(ev.data);
     };
 
     es.onerror = () => {
       if (es) es.close();
       es = null;
-      if (!paused) {
-        appendLine('[webui] disconnected — retrying in 2s');
-        setTimeout(connect, 2000);
-      }
+      // Exponential backoff with +/-25% jitter so restarts don't see a thundering herd.
+      const wait = Math.round(retryDelay * (0.75 + Math.random() * 0.5));
+      relayLine('[webui] disconnected — retrying in ' + wait + 'ms');
+      setTimeout(connect, wait);
+      retryDelay = Math.min(retryDelay * 2, 30000);
     };
   }
 
+  function startStream() {
+    if (!logChannel) {
+      connect();
+      return;
+    }
+    // Held for the life of the tab; the next tab in line takes over when it closes.
+    navigator.locks.request('webui-logs-stream', () => {
+      isStreamLeader = true;
+      connect();
+      return new Promise(() => {});
+    });
+  }
+
+  // Pausing only stops rendering; the stream stays up for any other tabs.
   pauseBtn.addEventListener('click', () => {
     paused = !paused;
     pauseBtn.textContent = paused ? 'Resume' : 'Pause';
-    if (paused) {
-      if (es) es.close();
-      es = null;
-    } else {
-      connect();
-    }
   });
 
   clearBtn.addEventListener('click', () => {
@@ -524,7 +973,7 @@ def _logs_body(token_required: bool) -> str:
       streamTail = 500;
     }
 
-    connect();
+    startStream();
   })();
 </script>
 """
@@ -532,6 +981,7 @@ def _logs_body(token_required: bool) -> str:
     return html.replace("__TOKEN_HINT__", token_hint)
 
 
+@functools.cache
 def _settings_body() -> str:
     return """
 <div class="card">
@@ -618,7 +1068,7 @@ def _settings_body() -> str:
     </div>
   </div>
 
-	<script>
+	<script type="module">
 	  const guildSelect = document.getElementById('guildSelect');
   const guildPill = document.getElementById('guildPill');
   const elMaxChars = document.getElementById('maxChars');
@@ -636,6 +1086,10 @@ def _settings_body() -> str:
   let current = null;
   let allVoices = [];
   let allowedSet = new Set();
+  let allVoiceIds = [];
+  let allVoiceIdSet = new Set();
+  let voicesGeneration = 0;
+  let allowedRenderKey = null;
 
   function pill(el, ok, text) {
     el.textContent = text;
@@ -643,34 +1097,42 @@ def _settings_body() -> str:
     el.classList.add(ok ? 'ok' : 'warn');
   }
 
+  // localStorage is synchronous; read it once and coalesce writes.
+  let savedGuildId = (localStorage.getItem('web_guild_id') || '').trim();
+  const persistGuildId = debounce((id) => localStorage.setItem('web_guild_id', id), 300);
+
+  function rememberGuildId(id) {
+    if (id === savedGuildId) return;
+    savedGuildId = id;
+    persistGuildId(id);
+  }
+
   function selectedGuildId() {
     return (guildSelect.value || '').trim();
   }
 
-  async function loadGuilds() {
-    const res = await apiFetch('/api/guilds');
+  function renderGuilds(res) {
     const guilds = (res && Array.isArray(res.guilds)) ? res.guilds : [];
 
+    const wanted = selectedGuildId() || savedGuildId;
     guildSelect.textContent = '';
     if (!guilds.length) {
       pill(guildPill, false, 'No servers');
       return;
     }
 
-    for (const g of guilds) {
-      const opt = document.createElement('option');
-      opt.value = g.id;
-      opt.textContent = `${g.name} (${g.id})`;
-      guildSelect.appendChild(opt);
-    }
+    guildSelect.innerHTML = optionsHtml(guilds, g => `${g.name} (${g.id})`);
 
-    const saved = (localStorage.getItem('web_guild_id') || '').trim();
-    const ok = saved && guilds.some(g => g.id === saved);
-    guildSelect.value = ok ? saved : guilds[0].id;
-    localStorage.setItem('web_guild_id', selectedGuildId());
+    const ok = wanted && guilds.some(g => g.id === wanted);
+    guildSelect.value = ok ? wanted : guilds[0].id;
+    rememberGuildId(selectedGuildId());
     pill(guildPill, true, `${guilds.length} servers`);
   }
 
+  async function loadGuilds() {
+    renderGuilds(await cachedFetch('/api/guilds', 60000));
+  }
+
 	  async function loadSettings() {
 	    const gid = selectedGuildId();
 	    if (!gid) return;
@@ -678,34 +1140,33 @@ def _settings_body() -> str:
 	    applyCurrentToForm();
 	  }
 
-	  async function loadVoices() {
-	    const res = await apiFetch('/api/voices');
+	  function applyVoices(res) {
 	    const voices = (res && Array.isArray(res.voices)) ? res.voices : [];
 	    allVoices = voices.map(v => ({ id: String(v.id), name: String(v.name || v.id) }));
+	    allVoiceIds = allVoices.map(v => v.id);
+	    allVoiceIdSet = new Set(allVoiceIds);
+	    voicesGeneration += 1;
 	    renderVoiceSelects();
 	    renderAllowedSelect();
 	  }
 
+	  async function loadVoices() {
+	    applyVoices(await cachedFetch('/api/voices', 60000));
+	  }
+
+	  window.addEventListener('webui:cache-refresh', (ev) => {
+	    if (ev.detail.url === '/api/guilds') renderGuilds(ev.detail.value);
+	    else if (ev.detail.url === '/api/voices') applyVoices(ev.detail.value);
+	  });
+
 	  function renderVoiceSelects() {
 	    if (!elFallbackVoice || !elDefaultVoice) return;
 	    const curFallback = (elFallbackVoice.value || '').trim();
 	    const curDefault = (elDefaultVoice.value || '').trim();
 
-	    const buildOptions = () => {
-	      const frag = document.createDocumentFragment();
-	      for (const v of allVoices) {
-	        const opt = document.createElement('option');
-	        opt.value = v.id;
-	        opt.textContent = v.name ? `${v.name} (${v.id})` : v.id;
-	        frag.appendChild(opt);
-	      }
-	      return frag;
-	    };
-
-	    elFallbackVoice.innerHTML = '';
-	    elDefaultVoice.innerHTML = '';
-	    elFallbackVoice.appendChild(buildOptions());
-	    elDefaultVoice.appendChild(buildOptions());
+	    const html = optionsHtml(allVoices, v => v.name ? `${v.name} (${v.id})` : v.id);
+	    elFallbackVoice.innerHTML = html;
+	    elDefaultVoice.innerHTML = html;
 
 	    if (curFallback) elFallbackVoice.value = curFallback;
 	    if (curDefault) elDefaultVoice.value = curDefault;
@@ -789,18 +1250,14 @@ def _settings_body() -> str:
       const tok = (getToken() || '').trim();
       if (tok) qs.set('token', tok);
     }
-    qs.set('ts', String(Date.now())); // cache buster
     return '/api/voices/preview?' + qs.toString();
   }
 
   function renderAllowedSelect() {
     if (!allowedVoices) return;
-    allowedVoices.textContent = '';
     if (!allVoices.length) {
-      const opt = document.createElement('option');
-      opt.value = '';
-      opt.textContent = 'No voices loaded.';
-      allowedVoices.appendChild(opt);
+      allowedVoices.innerHTML = '<option value="">No voices loaded.</option>';
+      allowedRenderKey = null;
       updateVoiceCount();
       return;
     }
@@ -809,24 +1266,50 @@ def _settings_body() -> str:
     const required = new Set(requiredVoiceIds());
     const q = (voiceFilter.value || '').trim().toLowerCase();
 
+    // Same voices and filter as last time: only selection state can differ.
+    const key = q + '|' + voicesGeneration;
+    if (key === allowedRenderKey) {
+      for (const opt of allowedVoices.options) {
+        const isRequired = required.has(opt.value);
+        opt.disabled = isRequired;
+        opt.selected = isRequired || allowedSet.has(opt.value);
+      }
+      updateVoiceCount();
+      return;
+    }
+    allowedRenderKey = key;
+
+    let html = '';
     for (const v of allVoices) {
       const hay = (v.name + ' ' + v.id).toLowerCase();
       if (q && !hay.includes(q)) continue;
-      const opt = document.createElement('option');
-      opt.value = v.id;
-      opt.textContent = v.name ? `${v.name} (${v.id})` : v.id;
-      if (allowedSet.has(v.id)) opt.selected = true;
+      const label = v.name ? `${v.name} (${v.id})` : v.id;
+      let attrs = '';
       if (required.has(v.id)) {
-        opt.selected = true;
-        opt.disabled = true;
+        attrs = ' selected disabled';
         allowedSet.add(v.id);
+      } else if (allowedSet.has(v.id)) {
+        attrs = ' selected';
       }
-      allowedVoices.appendChild(opt);
+      html += `<option value="${escapeAttr(v.id)}"${attrs}>${escapeHtml(label)}</option>`;
     }
+    allowedVoices.innerHTML = html;
 
     updateVoiceCount();
   }
 
+  // Coalesce selection/required-voice changes into one render per frame.
+  let uiFramePending = false;
+  function scheduleUi() {
+    if (uiFramePending) return;
+    uiFramePending = true;
+    requestAnimationFrame(() => {
+      uiFramePending = false;
+      syncRequiredVoices();
+      renderAllowedSelect();
+    });
+  }
+
 	  function updateRestrictUi() {
 	    if (!current) return;
 	    pill(restrictPill, !!current.restrict_voices, current.restrict_voices ? 'enabled' : 'disabled');
@@ -840,12 +1323,10 @@ def _settings_body() -> str:
 	    const ordered = [];
 	    const seen = new Set();
 
-	    if (Array.isArray(allVoices) && allVoices.length) {
-	      for (const v of allVoices) {
-	        if (allowedSet.has(v.id) && !seen.has(v.id)) {
-	          ordered.push(v.id);
-	          seen.add(v.id);
-	        }
+	    for (const vid of allVoiceIds) {
+	      if (allowedSet.has(vid) && !seen.has(vid)) {
+	        ordered.push(vid);
+	        seen.add(vid);
 	      }
 	    }
 
@@ -874,23 +1355,15 @@ def _settings_body() -> str:
 		    payload.allowed_voice_ids = orderedAllowedVoiceIds();
         if (elAllowlistChannels) {
           const raw = (elAllowlistChannels.value || '').trim();
-          const ids = raw ? raw.split(',').map(x => x.trim()).filter(Boolean) : [];
-          const cleaned = [];
-          const seen = new Set();
-          for (const id of ids) {
-            const n = parseInt(id, 10);
-            if (!Number.isFinite(n) || n <= 0 || seen.has(n)) continue;
-            seen.add(n);
-            cleaned.push(n);
-          }
-          payload.allowlist_text_channel_ids = cleaned;
+          const ids = raw ? raw.split(',').map(x => parseInt(x.trim(), 10)) : [];
+          payload.allowlist_text_channel_ids = Array.from(new Set(ids.filter(n => Number.isFinite(n) && n > 0)));
         }
 
 	    return payload;
 	  }
 
 	  guildSelect.addEventListener('change', () => {
-	    localStorage.setItem('web_guild_id', selectedGuildId());
+	    rememberGuildId(selectedGuildId());
 	    loadSettings().catch(e => {
 	      saveMsg.textContent = 'Error: ' + e.message;
       saveMsg.className = 'danger';
@@ -929,28 +1402,27 @@ def _settings_body() -> str:
   });
 
   document.getElementById('selectAllVoices').addEventListener('click', () => {
-    allowedSet = new Set(allVoices.map(v => v.id));
-    syncRequiredVoices();
-    renderAllowedSelect();
+    allowedSet = new Set(allVoiceIdSet);
+    scheduleUi();
   });
 
   document.getElementById('selectNoneVoices').addEventListener('click', () => {
     allowedSet = new Set();
-    syncRequiredVoices();
-    renderAllowedSelect();
+    scheduleUi();
   });
 
-  voiceFilter.addEventListener('input', () => {
+  voiceFilter.addEventListener('input', debounce(() => {
     if (!current || !current.restrict_voices) return;
     renderAllowedSelect();
-  });
+  }, 150));
 
   if (allowedVoices) {
     allowedVoices.addEventListener('change', () => {
-      const selected = Array.from(allowedVoices.selectedOptions || []).map(opt => opt.value);
-      allowedSet = new Set(selected);
-      syncRequiredVoices();
-      renderAllowedSelect();
+      const next = new Set();
+      const sel = allowedVoices.selectedOptions || [];
+      for (let i = 0; i < sel.length; i++) next.add(sel[i].value);
+      allowedSet = next;
+      scheduleUi();
     });
   }
 
@@ -958,9 +1430,9 @@ def _settings_body() -> str:
   if (previewVoiceBtn) {
     previewVoiceBtn.addEventListener('click', () => {
       if (!allowedVoices) return;
-      const selected = Array.from(allowedVoices.selectedOptions || []);
-      if (!selected.length) return;
-      const vid = selected[0].value;
+      const first = (allowedVoices.selectedOptions || [])[0];
+      if (!first) return;
+      const vid = first.value;
       voicePlayer.style.display = 'block';
       voicePlayer.src = buildPreviewUrl(vid);
       voicePlayer.play().catch(() => {});
@@ -969,14 +1441,12 @@ def _settings_body() -> str:
 
   elFallbackVoice.addEventListener('change', () => {
     if (!current || !current.restrict_voices) return;
-    syncRequiredVoices();
-    renderAllowedSelect();
+    scheduleUi();
   });
 
 	  elDefaultVoice.addEventListener('change', () => {
 	    if (!current || !current.restrict_voices) return;
-	    syncRequiredVoices();
-	    renderAllowedSelect();
+	    scheduleUi();
 	  });
 
 	  document.getElementById('saveBtn').addEventListener('click', async () => {
@@ -986,11 +1456,7 @@ def _settings_body() -> str:
 	      if (!gid) throw new Error('No server selected');
 	      const payload = buildPayloadFromForm();
 
-	      current = await apiFetch('/api/settings?guild_id=' + encodeURIComponent(gid), {
-	        method: 'POST',
-	        headers: { 'Content-Type': 'application/json' },
-	        body: JSON.stringify(payload),
-	      });
+	      current = await postJson('/api/settings?guild_id=' + encodeURIComponent(gid), payload);
 	      allowedSet = new Set(Array.isArray(current.allowed_voice_ids) ? current.allowed_voice_ids.map(String) : []);
 	      updateRestrictUi();
 	      saveMsg.textContent = 'Saved.';
@@ -1003,9 +1469,15 @@ def _settings_body() -> str:
 
   (async () => {
     try {
-      await loadGuilds();
-      await loadVoices();
-      await loadSettings();
+      const boot = readBoot();
+      if (boot) {
+        renderGuilds(boot);
+        applyVoices(boot);
+        await loadSettings();
+      } else {
+        // Settings need the selected guild; voices are independent, so fetch them alongside.
+        await Promise.all([loadGuilds().then(loadSettings), loadVoices()]);
+      }
     } catch (e) {
       saveMsg.textContent = 'Error: ' + e.message;
       saveMsg.className = 'danger';
@@ -1015,6 +1487,7 @@ def _settings_body() -> str:
 """
 
 
+@functools.cache
 def _test_voices_body() -> str:
     return """
 <div class="card">
@@ -1162,7 +1635,7 @@ Authorization: Bearer YOUR_TOKEN_HERE
   <p class="muted" style="margin:8px 0 0 0;">Response: <code>{"success": true, "suggestions": [{"title": "Save Your Tears", "artist": "The Weeknd"}, {"title": "Take My Breath", "artist": "The Weeknd"}]}</code></p>
 </div>
 
-<script>
+<script type="module">
   const guildSelect = document.getElementById('guildSelect');
   const channelSelect = document.getElementById('channelSelect');
   const voiceSelect = document.getElementById('voiceSelect');
@@ -1189,6 +1662,75 @@ Authorization: Bearer YOUR_TOKEN_HERE
   let guilds = [];
   let voices = [];
   
+  // Preview clips keyed by voice + text, kept in IndexedDB so repeat previews skip synthesis.
+  const PREVIEW_DB = 'ttsPreviewCache';
+  const PREVIEW_STORE = 'blobs';
+  const PREVIEW_MAX = 50;
+  let previewDbPromise = null;
+
+  function openPreviewDb() {
+    if (!window.indexedDB) return Promise.resolve(null);
+    if (!previewDbPromise) {
+      previewDbPromise = new Promise((resolve) => {
+        const req = indexedDB.open(PREVIEW_DB, 1);
+        req.onupgradeneeded = () => {
+          const store = req.result.createObjectStore(PREVIEW_STORE, { keyPath: 'key' });
+          store.createIndex('t', 't');
+        };
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => resolve(null);
+      });
+    }
+    return previewDbPromise;
+  }
+
+  async function previewCacheGet(key) {
+    const db = await openPreviewDb();
+    if (!db) return null;
+    return new Promise((resolve) => {
+      const req = db.transaction(PREVIEW_STORE, 'readonly').objectStore(PREVIEW_STORE).get(key);
+      req.onsuccess = () => resolve(req.result || null);
+      req.onerror = () => resolve(null);
+    });
+  }
+
+  async function previewCachePut(key, blob) {
+    const db = await openPreviewDb();
+    if (!db) return;
+    const store = db.transaction(PREVIEW_STORE, 'readwrite').objectStore(PREVIEW_STORE);
+    store.put({ key, blob, t: Date.now() });
+    const countReq = store.count();
+    countReq.onsuccess = () => {
+      let excess = countReq.result - PREVIEW_MAX;
+      if (excess <= 0) return;
+      // Oldest first via the timestamp index.
+      store.index('t').openCursor().onsuccess = (ev) => {
+        const cursor = ev.target.result;
+        if (!cursor || excess <= 0) return;
+        cursor.delete();
+        excess -= 1;
+        cursor.continue();
+      };
+    };
+  }
+
+  // Encoded preview URLs, FIFO-bounded.
+  const PREVIEW_URL_MAX = 64;
+  const previewUrlCache = new Map();
+
+  function previewUrl(voiceId, text) {
+    const key = voiceId + '\\u0000' + text;
+    let url = previewUrlCache.get(key);
+    if (!url) {
+      url = '/api/voices/preview?voice_id=' + encodeURIComponent(voiceId) + '&text=' + encodeURIComponent(text);
+      if (previewUrlCache.size >= PREVIEW_URL_MAX) {
+        previewUrlCache.delete(previewUrlCache.keys().next().value);
+      }
+      previewUrlCache.set(key, url);
+    }
+    return url;
+  }
+
   function showStatus(msg, isError = false) {
     statusMsg.textContent = msg;
     statusMsg.className = isError ? 'danger' : 'muted';
@@ -1204,50 +1746,46 @@ Authorization: Bearer YOUR_TOKEN_HERE
     suggestStatusMsg.className = isError ? 'danger' : 'muted';
   }
   
+  function renderGuilds(res) {
+    guilds = (res && Array.isArray(res.guilds)) ? res.guilds : [];
+    const prev = guildSelect.value;
+    const prevDj = djGuildSelect.value;
+
+    const html = guilds.length
+      ? '<option value="">Select a server...</option>' + optionsHtml(guilds, g => g.name)
+      : '<option value="">No servers available</option>';
+    guildSelect.innerHTML = html;
+    djGuildSelect.innerHTML = html;
+    if (prev) guildSelect.value = prev;
+    if (prevDj) djGuildSelect.value = prevDj;
+  }
+
+  function renderVoices(res) {
+    voices = (res && Array.isArray(res.voices)) ? res.voices : [];
+    const prev = voiceSelect.value;
+    const prevDj = djVoiceSelect.value;
+
+    const html = optionsHtml(voices, v => v.name ? `${v.name} (${v.id})` : v.id);
+    voiceSelect.innerHTML = html;
+    
+    if (prev && voices.some(v => v.id === prev)) {
+      voiceSelect.value = prev;
+    } else if (voices.length > 0) {
+      voiceSelect.value = voices[0].id;
+    }
+
+    djVoiceSelect.innerHTML = '<option value="">Default voice</option>' + html;
+    if (prevDj) djVoiceSelect.value = prevDj;
+  }
+
+  window.addEventListener('webui:cache-refresh', (ev) => {
+    if (ev.detail.url === '/api/guilds') renderGuilds(ev.detail.value);
+    else if (ev.detail.url === '/api/voices') renderVoices(ev.detail.value);
+  });
+
   async function loadGuilds() {
     try {
-      const res = await apiFetch('/api/guilds');
-      guilds = (res && Array.isArray(res.guilds)) ? res.guilds : [];
-      
-      guildSelect.textContent = '';
-      if (!guilds.length) {
-        const opt = document.createElement('option');
-        opt.value = '';
-        opt.textContent = 'No servers available';
-        guildSelect.appendChild(opt);
-        return;
-      }
-      
-      const placeholder = document.createElement('option');
-      placeholder.value = '';
-      placeholder.textContent = 'Select a server...';
-      guildSelect.appendChild(placeholder);
-      
-      for (const g of guilds) {
-        const opt = document.createElement('option');
-        opt.value = g.id;
-        opt.textContent = g.name;
-        guildSelect.appendChild(opt);
-      }
-
-      djGuildSelect.textContent = '';
-      if (!guilds.length) {
-        const opt = document.createElement('option');
-        opt.value = '';
-        opt.textContent = 'No servers available';
-        djGuildSelect.appendChild(opt);
-      } else {
-        const placeholder = document.createElement('option');
-        placeholder.value = '';
-        placeholder.textContent = 'Select a server...';
-        djGuildSelect.appendChild(placeholder);
-        for (const g of guilds) {
-          const opt = document.createElement('option');
-          opt.value = g.id;
-          opt.textContent = g.name;
-          djGuildSelect.appendChild(opt);
-        }
-      }
+      renderGuilds(await cachedFetch('/api/guilds', 60000));
     } catch (e) {
       showStatus('Error loading guilds: ' + e.message, true);
       showDjStatus('Error loading guilds: ' + e.message, true);
@@ -1256,32 +1794,7 @@ Authorization: Bearer YOUR_TOKEN_HERE
   
   async function loadVoices() {
     try {
-      const res = await apiFetch('/api/voices');
-      voices = (res && Array.isArray(res.voices)) ? res.voices : [];
-      
-      voiceSelect.textContent = '';
-      for (const v of voices) {
-        const opt = document.createElement('option');
-        opt.value = v.id;
-        opt.textContent = v.name ? `${v.name} (${v.id})` : v.id;
-        voiceSelect.appendChild(opt);
-      }
-      
-      if (voices.length > 0) {
-        voiceSelect.value = voices[0].id;
-      }
-
-      djVoiceSelect.textContent = '';
-      const noneOpt = document.createElement('option');
-      noneOpt.value = '';
-      noneOpt.textContent = 'Default voice';
-      djVoiceSelect.appendChild(noneOpt);
-      for (const v of voices) {
-        const opt = document.createElement('option');
-        opt.value = v.id;
-        opt.textContent = v.name ? `${v.name} (${v.id})` : v.id;
-        djVoiceSelect.appendChild(opt);
-      }
+      renderVoices(await cachedFetch('/api/voices', 60000));
     } catch (e) {
       showStatus('Error loading voices: ' + e.message, true);
       showDjStatus('Error loading voices: ' + e.message, true);
@@ -1346,17 +1859,24 @@ Authorization: Bearer YOUR_TOKEN_HERE
       showStatus('Generating audio preview...');
       previewBtn.disabled = true;
       
-      const url = '/api/voices/preview?voice_id=' + encodeURIComponent(voiceId) + 
-                  '&text=' + encodeURIComponent(text.substring(0, 200));
-      
-      const headers = authHeaders();
-      const response = await fetch(url, { headers });
-      
-      if (!response.ok) {
-        throw new Error('Failed to generate preview: ' + response.statusText);
+      const clipped = text.substring(0, 200);
+      const cacheKey = voiceId + '|' + clipped;
+      let blob = null;
+      const hit = await previewCacheGet(cacheKey);
+      if (hit) {
+        blob = hit.blob;
+        previewCachePut(cacheKey, blob).catch(() => {});
+      } else {
+        const response = await fetch(previewUrl(voiceId, clipped), { headers: authHeaders() });
+        
+        if (!response.ok) {
+          throw new Error('Failed to generate preview: ' + response.statusText);
+        }
+        
+        blob = await response.blob();
+        previewCachePut(cacheKey, blob).catch(() => {});
       }
       
-      const blob = await response.blob();
       const audioUrl = URL.createObjectURL(blob);
       
       audioPlayer.src = audioUrl;
@@ -1401,11 +1921,7 @@ Authorization: Bearer YOUR_TOKEN_HERE
         voice_id: voiceId
       };
       
-      const result = await apiFetch('/api/tts', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(payload)
-      });
+      const result = await postJson('/api/tts', payload);
       
       showStatus(result.message || 'TTS request sent successfully!');
     } catch (e) {
@@ -1451,11 +1967,7 @@ Authorization: Bearer YOUR_TOKEN_HERE
       if (requestedBy) payload.requested_by = requestedBy;
       if (songFor) payload.song_for = songFor;
 
-      const result = await apiFetch('/api/radio-presenter', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(payload),
-      });
+      const result = await postJson('/api/radio-presenter', payload);
 
       showDjStatus(result.message || 'DJ intro queued successfully!');
     } catch (e) {
@@ -1489,11 +2001,7 @@ Authorization: Bearer YOUR_TOKEN_HERE
         artist: artist,
       };
 
-      const result = await apiFetch('/api/song-suggestions', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(payload),
-      });
+      const result = await postJson('/api/song-suggestions', payload);
 
       const suggestions = (result && Array.isArray(result.suggestions)) ? result.suggestions : [];
       if (!suggestions.length) {
@@ -1501,8 +2009,12 @@ Authorization: Bearer YOUR_TOKEN_HERE
         return;
       }
 
-      const lines = suggestions.map((s, i) => `${i + 1}. ${s.title} — ${s.artist}`);
-      suggestResults.textContent = lines.join('\\n');
+      let out = '';
+      for (let i = 0; i < suggestions.length; i++) {
+        const s = suggestions[i];
+        out += (i ? '\\n' : '') + (i + 1) + '. ' + s.title + ' — ' + s.artist;
+      }
+      suggestResults.textContent = out;
       suggestResults.style.display = 'block';
       showSuggestStatus('Suggestions ready.');
     } catch (e) {
@@ -1514,13 +2026,19 @@ Authorization: Bearer YOUR_TOKEN_HERE
   
   // Load initial data
   (async () => {
-    await loadGuilds();
-    await loadVoices();
+    const boot = readBoot();
+    if (boot) {
+      renderGuilds(boot);
+      renderVoices(boot);
+      return;
+    }
+    await Promise.all([loadGuilds(), loadVoices()]);
   })();
 </script>
 """
 
 
+@functools.cache
 def _obs_player_body() -> str:
     return """
 <section class="card">
@@ -1562,7 +2080,7 @@ def _obs_player_body() -> str:
   <audio id="player" preload="auto"></audio>
 </section>
 
-<script>
+<script type="module">
   const wsUrlEl = document.getElementById('wsUrl');
   const tokenEl = document.getElementById('token');
   const connectBtn = document.getElementById('connectBtn');
@@ -1575,9 +2093,59 @@ def _obs_player_body() -> str:
   const playStatus = document.getElementById('playStatus');
   const player = document.getElementById('player');
 
+  const OBS_DEFAULTS = JSON.parse('{"wsPath":"/ws/tts","mime":"audio/mpeg"}');
+
   let ws = null;
   let chunks = [];
 
+  // Prefer MediaSource so playback starts with the first chunk; fall back to
+  // collecting the whole clip into a Blob where MSE can't take MP3.
+  const STREAM_MIME = OBS_DEFAULTS.mime;
+  const canStream = !!(window.MediaSource && MediaSource.isTypeSupported(STREAM_MIME));
+  let mediaSource = null;
+  let sourceBuffer = null;
+  let pendingAppends = [];
+  let streamEnded = false;
+
+  const pumpAppends = () => {
+    if (!mediaSource || !sourceBuffer || sourceBuffer.updating) return;
+    if (pendingAppends.length) {
+      sourceBuffer.appendBuffer(pendingAppends.shift());
+    } else if (streamEnded && mediaSource.readyState === 'open') {
+      mediaSource.endOfStream();
+    }
+  };
+
+  // Blob fallback: stage frames and fold them into `chunks` off the hot path.
+  let stagedChunks = [];
+  let stageScheduled = false;
+  const scheduleIdle = window.requestIdleCallback
+    ? (fn) => window.requestIdleCallback(fn, { timeout: 50 })
+    : (fn) => setTimeout(fn, 16);
+
+  const flushStagedChunks = () => {
+    stageScheduled = false;
+    if (!stagedChunks.length) return;
+    chunks = chunks.concat(stagedChunks);
+    stagedChunks = [];
+  };
+
+  const startMediaStream = () => {
+    pendingAppends = [];
+    streamEnded = false;
+    sourceBuffer = null;
+    const ms = new MediaSource();
+    mediaSource = ms;
+    ms.addEventListener('sourceopen', () => {
+      if (ms !== mediaSource) return;
+      sourceBuffer = ms.addSourceBuffer(STREAM_MIME);
+      sourceBuffer.addEventListener('updateend', pumpAppends);
+      pumpAppends();
+    }, { once: true });
+    player.src = URL.createObjectURL(ms);
+    player.play().catch(() => {});
+  };
+
   const setStatus = (text, isError = false) => {
     connStatus.textContent = text;
     connStatus.className = 'pill ' + (isError ? 'warn' : 'ok');
@@ -1585,7 +2153,7 @@ def _obs_player_body() -> str:
 
   const defaultWsUrl = () => {
     const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
-    return `${scheme}://${window.location.host}/ws/tts`;
+    return `${scheme}://${window.location.host}${OBS_DEFAULTS.wsPath}`;
   };
 
   const readQueryToken = () => {
@@ -1620,21 +2188,40 @@ def _obs_player_body() -> str:
           const msg = JSON.parse(evt.data);
           if (msg.event === 'start') {
             chunks = [];
+            stagedChunks = [];
+            if (canStream) startMediaStream();
             playStatus.textContent = `Streaming (${msg.voice_id || ''})`;
           } else if (msg.event === 'end') {
             playStatus.textContent = 'Playing';
-            const blob = new Blob(chunks, { type: 'audio/mpeg' });
-            const url = URL.createObjectURL(blob);
-            player.src = url;
-            player.play().catch(() => {});
+            if (mediaSource) {
+              streamEnded = true;
+              pumpAppends();
+            } else {
+              flushStagedChunks();
+              const blob = new Blob(chunks, { type: STREAM_MIME });
+              const url = URL.createObjectURL(blob);
+              player.src = url;
+              player.play().catch(() => {});
+            }
           } else if (msg.event === 'error') {
+            if (mediaSource) {
+              streamEnded = true;
+              pumpAppends();
+            }
             playStatus.textContent = 'Error: ' + (msg.error || 'unknown');
           }
         } catch (e) {
           playStatus.textContent = 'Error: invalid JSON message';
         }
+      } else if (mediaSource) {
+        pendingAppends.push(evt.data);
+        pumpAppends();
       } else {
-        chunks.push(evt.data);
+        stagedChunks.push(evt.data);
+        if (!stageScheduled) {
+          stageScheduled = true;
+          scheduleIdle(flushStagedChunks);
+        }
       }
     };
   };
@@ -1679,26 +2266,98 @@ def _obs_player_body() -> str:
 """
 
 
+# page name -> (title, body builder, whether the layout shows the token banner)
+_PAGE_SOURCES: Dict[str, Tuple[str, Callable[[], str], bool]] = {
+    "index": ("TTS Bot - Home", _index_body, True),
+    "logs": ("TTS Bot - Logs", functools.partial(_logs_body, False), False),
+    "settings": ("TTS Bot - Settings", _settings_body, False),
+    "test_voices": ("TTS Bot - Test Voices", _test_voices_body, True),
+    "obs": ("TTS Bot - OBS Player", _obs_player_body, True),
+}
+
+
+@functools.cache
+def _render_page(name: str, token_required: bool) -> str:
+    # Rendered at most twice per page for the life of the process, however often the cog reloads.
+    title, body, shows_token = _PAGE_SOURCES[name]
+    return _layout(title, body(), token_required=token_required and shows_token)
+
+
 class WebUICog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self.enabled = _truthy(os.getenv("WEB_UI_ENABLED"), default=True)
-        self.host = os.getenv("WEB_HOST") or "127.0.0.1"
-        self.port = int(os.getenv("WEB_PORT") or "8080")
-        self.token = (os.getenv("WEB_UI_TOKEN") or "").strip() or None
+        self.enabled = WEB_UI_ENABLED
+        self.host = WEB_HOST
+        self.port = WEB_PORT
+        self.token = WEB_UI_TOKEN
+        self._token_bytes = self.token.encode("utf-8") if self.token else b""
+
+        # bot.py attaches these before loading extensions; bind them once.
+        self._start_time: Optional[float] = getattr(bot, "start_time", None)
+        self._log_buffer = getattr(bot, "log_buffer", None)
+        self._guild_store = getattr(bot, "guild_settings", None)
+        self._settings_store = getattr(bot, "settings", None)
+
+        # Pages depend only on whether a token is configured, so render them once:
+        # static pages as (body, etag, gzip body, brotli body), boot-data pages split around </body>.
+        token_required = bool(self.token)
+        self._pages: Dict[str, Tuple[bytes, str, bytes, Optional[bytes]]] = {
+            name: _encode_page(_render_page(name, token_required)) for name in ("index", "logs", "obs")
+        }
+        self._boot_pages: Dict[str, Tuple[bytes, bytes]] = {
+            name: _split_page(_render_page(name, token_required)) for name in ("settings", "test_voices")
+        }
 
         self._runner: Optional[web.AppRunner] = None
         self._site: Optional[web.TCPSite] = None
 
-        self._app = web.Application(middlewares=[self._auth_middleware])
+        # Static for the life of the process, so encode it once.
+        self._status_meta_body = _json_bytes(
+            {
+                "tts_version": VERSION,
+                "discord_py_version": discord.__version__,
+                "web_host": self.host,
+                "web_port": self.port,
+            }
+        )
+        # `,"tts_version":...}`: appended to the live object for the combined /api/status.
+        self._status_meta_tail = b"," + self._status_meta_body[1:]
+        # Encoded /api/status/live body, rebuilt each second by _refresh_status.
+        self._status_live_body: Optional[bytes] = None
+
+        # guild_id -> ids of voice channels with members; kept current by on_voice_state_update.
+        self._populated_vcs: Dict[int, set[int]] = {}
+
+        # Sorted guild list and its encoded /api/guilds body; reset on ready and guild join/remove/rename.
+        self._guilds: Optional[list[Dict[str, str]]] = None
+        self._guilds_json: Optional[bytes] = None
+
+        # guild_id -> (fetched at, store version, settings) for the TTS/DJ handlers.
+        self._tts_settings_cache: Dict[int, Tuple[float, int, dict]] = {}
+
+        # guild_id -> (store version, encoded JSON body); LRU-trimmed.
+        self._settings_cache: "OrderedDict[int, Tuple[int, bytes]]" = OrderedDict()
+
+        self._dj_batcher = _DJBatcher(window_ms=DJ_BATCH_WINDOW_MS, max_batch=DJ_BATCH_MAX)
+        # (title, artist, requested_by, for_user) -> generation in flight / (expiry, result) just finished.
+        self._dj_intro_inflight: Dict[Tuple[Any, ...], asyncio.Task] = {}
+        self._dj_intro_recent: Dict[Tuple[Any, ...], Tuple[float, Tuple[str, str, bool]]] = {}
+
+        middlewares = [_size_limit_middleware]
+        if self.token:
+            middlewares.append(_make_auth_middleware(self._token_bytes))
+        self._app = web.Application(middlewares=middlewares, client_max_size=MAX_BODY_BYTES)
         self._app.router.add_get("/", self.page_index)
         self._app.router.add_get("/logs", self.page_logs)
         self._app.router.add_get("/settings", self.page_settings)
         self._app.router.add_get("/test-voices", self.page_test_voices)
         self._app.router.add_get("/obs", self.page_obs_player)
+        self._app.router.add_get("/static/webui.js", self.static_webui_js)
 
 
         self._app.router.add_get("/api/status", self.api_status)
+        self._app.router.add_get("/api/status/live", self.api_status_live)
+        self._app.router.add_get("/api/status/meta", self.api_status_meta)
         self._app.router.add_get("/api/guilds", self.api_guilds)
         self._app.router.add_get("/api/voices", self.api_voices)
         self._app.router.add_get("/api/voices/preview", self.api_voice_preview)
@@ -1712,34 +2371,26 @@ class WebUICog(commands.Cog):
         self._app.router.add_post("/api/radio-presenter", self.api_radio_presenter)
         self._app.router.add_post("/api/song-suggestions", self.api_song_suggestions)
 
-    @web.middleware
-    async def _auth_middleware(self, request: web.Request, handler):
-        if request.path.startswith("/api/") and self.token:
-            if request.path in {
-                "/api/logs",
-                "/api/logs/stream",
-                "/api/status",
-                "/api/guilds",
-                "/api/voices",
-                "/api/voices/preview",
-                "/api/settings",
-                "/api/tts",  # Allow TTS requests without auth for testing
-                "/api/radio-presenter",  # Allow settings access without auth for testing
-                "/api/song-suggestions",
-            }:
-                return await handler(request)
-            token = _get_bearer_token(request)
-            if token != self.token:
-                return web.json_response({"error": "unauthorized"}, status=401)
-        return await handler(request)
-
     async def cog_load(self) -> None:
         if not self.enabled:
             logger.info("Web UI disabled (WEB_UI_ENABLED is falsey).")
             return
+        # Handlers use these without None checks, so refuse to serve if bot.py didn't attach them.
+        missing = [
+            name
+            for name, value in (("log_buffer", self._log_buffer), ("settings", self._settings_store))
+            if value is None
+        ]
+        if missing:
+            raise RuntimeError("Web UI needs bot." + " and bot.".join(missing) + " set before the cog loads")
+        self._dj_batcher.start()
+        self._refresh_status.start()
         await self.start_server()
 
     def cog_unload(self) -> None:
+        self.bot.loop.create_task(self._dj_batcher.stop())
+        self._refresh_status.cancel()
+        self.bot.loop.create_task(close_async_client())
         if self._runner is None:
             return
         self.bot.loop.create_task(self.stop_server())
@@ -1748,7 +2399,8 @@ class WebUICog(commands.Cog):
         if self._runner is not None:
             return
 
-        self._runner = web.AppRunner(self._app)
+        # Access lines go to the webui logger at DEBUG, not through aiohttp's format-driven AccessLogger.
+        self._runner = web.AppRunner(self._app, access_log_class=_AccessLogger, access_log=logger)
         await self._runner.setup()
         self._site = web.TCPSite(self._runner, host=self.host, port=self.port)
         await self._site.start()
@@ -1762,71 +2414,203 @@ class WebUICog(commands.Cog):
         self._site = None
         logger.info("Web UI stopped")
 
+    @commands.Cog.listener()
+    async def on_voice_state_update(
+        self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState
+    ) -> None:
+        if before.channel == after.channel:
+            return
+        populated = self._populated_vcs.get(member.guild.id)
+        if populated is None:
+            return  # Not indexed yet; seeded on first lookup.
+        # The member cache is already updated when this event fires.
+        if before.channel is not None and not before.channel.members:
+            populated.discard(before.channel.id)
+        if isinstance(after.channel, discord.VoiceChannel):
+            populated.add(after.channel.id)
+
+    def _invalidate_guilds(self) -> None:
+        self._guilds = None
+        self._guilds_json = None
+        self._status_live_body = None
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        self._invalidate_guilds()
+        # Voice states may have been missed while disconnected.
+        self._populated_vcs.clear()
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        self._invalidate_guilds()
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self._invalidate_guilds()
+        self._populated_vcs.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
+        if before.name != after.name:
+            self._invalidate_guilds()
+
+    def _find_populated_voice_channel(self, guild: discord.Guild) -> Optional[discord.VoiceChannel]:
+        populated = self._populated_vcs.get(guild.id)
+        if populated is None:
+            populated = {channel.id for channel in guild.voice_channels if channel.members}
+            self._populated_vcs[guild.id] = populated
+
+        if not populated:
+            return None
+        # Walk the guild's own channel order so the pick matches the first populated channel.
+        for channel in guild.voice_channels:
+            if channel.id in populated and channel.members:
+                return channel
+        return None
+
+    async def _generate_dj_intro(
+        self, *, title: str, artist: str, requested_by: Optional[str], for_user: Optional[str]
+    ) -> Tuple[str, str, bool]:
+        """Identical concurrent requests share one generation; results are reused briefly."""
+        key = (title, artist, requested_by, for_user)
+        recent = self._dj_intro_recent.get(key)
+        if recent is not None:
+            if time.monotonic() < recent[0]:
+                return recent[1]
+            del self._dj_intro_recent[key]
+
+        task = self._dj_intro_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._dj_batcher.submit(title=title, artist=artist, requested_by=requested_by, for_user=for_user)
+            )
+            self._dj_intro_inflight[key] = task
+            task.add_done_callback(functools.partial(self._dj_intro_finished, key))
+        # Shielded so one client disconnecting doesn't cancel it for the others.
+        return await asyncio.shield(task)
+
+    def _dj_intro_finished(self, key: Tuple[Any, ...], task: asyncio.Task) -> None:
+        self._dj_intro_inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        now = time.monotonic()
+        for stale in [k for k, (expiry, _) in self._dj_intro_recent.items() if expiry <= now]:
+            del self._dj_intro_recent[stale]
+        self._dj_intro_recent[key] = (now + DJ_INTRO_CACHE_TTL, task.result())
+
+    async def _get_settings_cached(self, tts_cog: Any, guild_id: int) -> dict:
+        guild_store = self._guild_store
+        version = guild_store.version(guild_id) if guild_store is not None else 0
+        now = time.monotonic()
+        cached = self._tts_settings_cache.get(guild_id)
+        if cached is not None and now - cached[0] < TTS_SETTINGS_TTL and cached[1] == version:
+            return cached[2]
+
+        settings = await tts_cog.get_settings(guild_id)
+        self._tts_settings_cache[guild_id] = (now, version, settings)
+        return settings
+
     @property
     def _token_required(self) -> bool:
         return bool(self.token)
 
+    def _encoded_html_response(
+        self,
+        request: web.Request,
+        body: bytes,
+        etag: str,
+        gz: Optional[bytes] = None,
+        br: Optional[bytes] = None,
+    ) -> web.Response:
+        # Always revalidate: a restart can change the pages, and a 304 costs no body.
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if _etag_matches(request, etag):
+            return web.Response(status=304, headers=headers)
+
+        if gz is None:
+            resp = web.Response(body=body, content_type="text/html", charset="utf-8", headers=headers)
+            # gzip/deflate, negotiated from Accept-Encoding.
+            resp.enable_compression()
+            return resp
+        accept = request.headers.get("Accept-Encoding", "")
+        if br is not None and "br" in accept:
+            headers["Content-Encoding"] = "br"
+            body = br
+        elif "gzip" in accept:
+            headers["Content-Encoding"] = "gzip"
+            body = gz
+        return web.Response(body=body, content_type="text/html", charset="utf-8", headers=headers)
+
     async def page_index(self, request: web.Request) -> web.Response:
-        html = _layout("TTS Bot - Home", _index_body(), token_required=self._token_required)
-        return web.Response(text=html, content_type="text/html")
+        return self._encoded_html_response(request, *self._pages["index"])
 
     async def page_logs(self, request: web.Request) -> web.Response:
-        html = _layout("TTS Bot - Logs", _logs_body(False), token_required=False)
-        return web.Response(text=html, content_type="text/html")
+        return self._encoded_html_response(request, *self._pages["logs"])
+
+    def _boot_data(self) -> Dict[str, Any]:
+        return {"guilds": self._guild_list(), "voices": _voice_list()}
+
+    def _boot_response(self, request: web.Request, page: str) -> web.Response:
+        # Page scripts are modules and run after parsing, so the boot block
+        # can sit at the end of the prebuilt layout; only it is encoded per request.
+        head, tail = self._boot_pages[page]
+        body = head + _boot_script(self._boot_data()).encode("utf-8") + tail
+        return self._encoded_html_response(request, body, _page_etag(body))
 
     async def page_settings(self, request: web.Request) -> web.Response:
-        html = _layout("TTS Bot - Settings", _settings_body(), token_required=False)
-        return web.Response(text=html, content_type="text/html")
+        return self._boot_response(request, "settings")
 
     async def page_test_voices(self, request: web.Request) -> web.Response:
-        html = _layout("TTS Bot - Test Voices", _test_voices_body(), token_required=self._token_required)
-        return web.Response(text=html, content_type="text/html")
+        return self._boot_response(request, "test_voices")
 
     async def page_obs_player(self, request: web.Request) -> web.Response:
-        html = _layout("TTS Bot - OBS Player", _obs_player_body(), token_required=self._token_required)
-        return web.Response(text=html, content_type="text/html")
+        return self._encoded_html_response(request, *self._pages["obs"])
     
+    async def static_webui_js(self, request: web.Request) -> web.Response:
+        # The URL carries a content hash, so the file can be cached indefinitely.
+        return web.Response(
+            body=_WEBUI_JS_BYTES,
+            content_type="application/javascript",
+            charset="utf-8",
+            headers={"Cache-Control": "public, max-age=31536000, immutable"},
+        )
+
     async def api_radio_presenter(self, request: web.Request) -> web.Response:
         if request.method != "POST":
             raise web.HTTPMethodNotAllowed(method=request.method, allowed_methods=["POST"])
         try:
-            data = await request.json()
+            data = _json_loads(await request.read())
         except Exception:
             raise web.HTTPBadRequest(text="Invalid JSON body")
         
-        song_name = (data.get("song_name") or "").strip()
-        artist = (data.get("artist") or "").strip()
-        raw_guild_id = str(data.get("guild_id") or "").strip()
+        song_name = _str_field(data.get("song_name"))
+        artist = _str_field(data.get("artist"))
+        raw_guild_id = _str_field(data.get("guild_id"))
         channel_id = data.get("channel_id")
-        voice_id = (data.get("voice") or "").strip() or None
+        voice_id = _str_field(data.get("voice")) or None
         requested_by = data.get("requested_by")
         song_for = data.get("song_for")
-        volume = data.get("volume", 0.5)
 
         if not song_name:
-            return web.json_response({"error": "song_name is required"}, status=400)
+            return _json_response({"error": "song_name is required"}, status=400)
         if not artist:
-            return web.json_response({"error": "artist is required"}, status=400)
+            return _json_response({"error": "artist is required"}, status=400)
         if not raw_guild_id:
-            return web.json_response({"error": "guild_id is required"}, status=400)
-        try:
-            guild_id = int(raw_guild_id)
-        except ValueError:
-            return web.json_response({"error": "guild_id must be an integer"}, status=400)
+            return _json_response({"error": "guild_id is required"}, status=400)
+        guild_id = _parse_id(raw_guild_id)
+        if guild_id is None:
+            return _json_response({"error": "guild_id must be an integer"}, status=400)
 
         guild = self.bot.get_guild(guild_id)
         if not guild:
-            return web.json_response({"error": "Unknown guild or bot not in that server"}, status=404)
+            return _json_response({"error": "Unknown guild or bot not in that server"}, status=404)
 
-        from utils.open_ai import dj_intro, dj_intro_fallback
         try:
-            text_to_speak, raw_intro, used_fallback = await asyncio.to_thread(
-                dj_intro,
+            text_to_speak, raw_intro, used_fallback = await self._generate_dj_intro(
                 title=song_name,
                 artist=artist,
                 requested_by=requested_by,
                 for_user=song_for,
-                return_debug=True,
             )
         except Exception as exc:
             logger.warning("DJ intro generation failed: %s", exc)
@@ -1841,62 +2625,55 @@ class WebUICog(commands.Cog):
 
         text_to_speak = (text_to_speak or "").strip()
         if not text_to_speak:
-            return web.json_response({"error": "Generated intro was empty"}, status=500)
+            return _json_response({"error": "Generated intro was empty"}, status=500)
 
         if used_fallback:
             logger.warning("DJ intro fallback used for guild %s. raw=%s", guild_id, raw_intro)
-        else:
+        elif logger.isEnabledFor(logging.INFO):
             logger.info("Generated DJ intro for guild %s: %s", guild_id, text_to_speak)
 
-        logger.info("Generated DJ intro for guild %s: %s", guild_id, text_to_speak)
-
         tts_cog = self.bot.get_cog("TTSCog")
         if not tts_cog:
-            return web.json_response({"error": "TTS cog not loaded"}, status=500)
+            return _json_response({"error": "TTS cog not loaded"}, status=500)
 
         target_channel = None
         state = tts_cog.get_state(guild_id)
 
         if channel_id:
-            try:
-                channel_id = int(channel_id)
-                target_channel = guild.get_channel(channel_id)
-                if not target_channel or not isinstance(target_channel, discord.VoiceChannel):
-                    return web.json_response({"error": "Invalid voice channel"}, status=400)
-            except (ValueError, TypeError):
-                return web.json_response({"error": "channel_id must be an integer"}, status=400)
+            channel_id = _parse_id(channel_id)
+            if channel_id is None:
+                return _json_response({"error": "channel_id must be an integer"}, status=400)
+            target_channel = guild.get_channel(channel_id)
+            if not target_channel or not isinstance(target_channel, discord.VoiceChannel):
+                return _json_response({"error": "Invalid voice channel"}, status=400)
         else:
             if state.voice_client and state.voice_client.is_connected():
                 target_channel = state.voice_client.channel
             else:
-                for channel in guild.voice_channels:
-                    if len(channel.members) > 0:
-                        target_channel = channel
-                        break
+                target_channel = self._find_populated_voice_channel(guild)
                 if not target_channel:
-                    return web.json_response(
+                    return _json_response(
                         {"error": "Bot is not in a voice channel. Join a voice channel first or specify channel_id"},
                         status=400,
                     )
 
-        ok = await tts_cog.ensure_connected(guild, target_channel)
+        ok = _connected_to(state, target_channel) or await tts_cog.ensure_connected(guild, target_channel)
         if not ok:
             locked_id = state.voice_channel_id
             msg = "Bot is currently locked to another voice channel"
             if locked_id:
                 msg = f"Bot is locked to channel {locked_id}"
-            return web.json_response({"error": msg}, status=409)
+            return _json_response({"error": msg}, status=409)
 
-        settings = await tts_cog.get_settings(guild_id)
+        settings = await self._get_settings_cached(tts_cog, guild_id)
         if voice_id:
             voice_id = tts_cog._effective_voice_id(settings, voice_id, allow_default=True)
         else:
             voice_id = str(settings.get("default_voice_id", FALLBACK_VOICE))
 
-        from cogs.tts import QueueItem
-        await state.queue.put(QueueItem(text=text_to_speak, voice_id=voice_id, volume=volume))
+        await state.queue.put(QueueItem(text=text_to_speak, voice_id=voice_id))
 
-        return web.json_response({
+        return _json_response({
             "success": True,
             "message": "DJ intro queued successfully",
             "guild_id": str(guild_id),
@@ -1911,22 +2688,20 @@ class WebUICog(commands.Cog):
         if request.method != "POST":
             raise web.HTTPMethodNotAllowed(method=request.method, allowed_methods=["POST"])
         try:
-            data = await request.json()
+            data = _json_loads(await request.read())
         except Exception:
             raise web.HTTPBadRequest(text="Invalid JSON body")
 
-        song_name = (data.get("song_name") or "").strip()
-        artist = (data.get("artist") or "").strip()
+        song_name = _str_field(data.get("song_name"))
+        artist = _str_field(data.get("artist"))
 
         if not song_name:
-            return web.json_response({"error": "song_name is required"}, status=400)
+            return _json_response({"error": "song_name is required"}, status=400)
         if not artist:
-            return web.json_response({"error": "artist is required"}, status=400)
+            return _json_response({"error": "artist is required"}, status=400)
 
-        from utils.open_ai import song_suggestions
         try:
-            suggestions, raw, used_fallback = await asyncio.to_thread(
-                song_suggestions,
+            suggestions, raw, used_fallback = await song_suggestions_async(
                 title=song_name,
                 artist=artist,
                 return_debug=True,
@@ -1935,7 +2710,7 @@ class WebUICog(commands.Cog):
             logger.warning("Song suggestions failed: %s", exc)
             suggestions, raw, used_fallback = [], "", True
 
-        return web.json_response({
+        return _json_response({
             "success": True,
             "song_name": song_name,
             "artist": artist,
@@ -1946,36 +2721,68 @@ class WebUICog(commands.Cog):
 
 
 
-    async def api_status(self, request: web.Request) -> web.Response:
-        start_time = getattr(self.bot, "start_time", None)
+    def _status_live(self) -> Dict[str, Any]:
+        start_time = self._start_time
         uptime = 0.0
         if start_time is not None:
             uptime = time.time() - float(start_time)
 
-        data = {
+        return {
             "user": str(self.bot.user) if self.bot.user else None,
-            "tts_version": VERSION,
-            "discord_py_version": discord.__version__,
             "guild_count": len(self.bot.guilds),
             "uptime_seconds": uptime,
-            "web_host": self.host,
-            "web_port": self.port,
         }
-        return web.json_response(data)
+
+    @tasks.loop(seconds=1)
+    async def _refresh_status(self) -> None:
+        # Dashboards poll status from every open tab; build the body once per tick.
+        self._status_live_body = _json_bytes(self._status_live())
+
+    def _status_live_bytes(self) -> bytes:
+        body = self._status_live_body
+        if body is None:
+            body = self._status_live_body = _json_bytes(self._status_live())
+        return body
+
+    async def api_status(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self._status_live_bytes()[:-1] + self._status_meta_tail,
+            content_type="application/json",
+            charset="utf-8",
+        )
+
+    async def api_status_live(self, request: web.Request) -> web.Response:
+        return web.Response(body=self._status_live_bytes(), content_type="application/json", charset="utf-8")
+
+    async def api_status_meta(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self._status_meta_body,
+            content_type="application/json",
+            charset="utf-8",
+            headers={"Cache-Control": "max-age=300"},
+        )
+
+    def _guild_list(self) -> list[Dict[str, str]]:
+        if self._guilds is None:
+            guilds = [{"id": str(g.id), "name": g.name} for g in self.bot.guilds]
+            guilds.sort(key=lambda g: (g.get("name") or "").lower())
+            self._guilds = guilds
+        return self._guilds
 
     async def api_guilds(self, request: web.Request) -> web.Response:
-        guilds = [{"id": str(g.id), "name": g.name} for g in self.bot.guilds]
-        guilds.sort(key=lambda g: (g.get("name") or "").lower())
-        return web.json_response({"guilds": guilds})
+        if self._guilds_json is None:
+            self._guilds_json = _json_bytes({"guilds": self._guild_list()})
+        return web.Response(body=self._guilds_json, content_type="application/json", charset="utf-8")
 
     async def api_voices(self, request: web.Request) -> web.Response:
-        voices = [{"id": voice_id, "name": name} for voice_id, name in ALL_VOICES]
-        return web.json_response({"voices": voices})
+        return web.Response(body=_VOICES_JSON_BYTES, content_type="application/json", charset="utf-8")
 
-    async def api_voice_preview(self, request: web.Request) -> web.StreamResponse:
+    async def api_voice_preview(self, request: web.Request) -> web.Response:
         voice_id = (request.query.get("voice_id") or "").strip()
         if not voice_id:
             raise web.HTTPBadRequest(text="voice_id is required")
+        if voice_id not in ALL_VOICE_IDS_SET:
+            raise web.HTTPBadRequest(text="Unknown voice_id")
 
         text = (request.query.get("text") or "").strip()
         if not text:
@@ -1985,169 +2792,161 @@ class WebUICog(commands.Cog):
         if len(text) > 200:
             text = text[:200]
 
+        # The same (voice, text) pair always renders the same clip, so let the browser reuse it.
+        etag = '"' + hashlib.blake2b(f"{voice_id}\x00{text}".encode("utf-8"), digest_size=16).hexdigest() + '"'
+        cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=3600, immutable"}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers=cache_headers)
+
         try:
-            stream, producer_task = await get_tts_stream(text, voice_id, fallback_voice=FALLBACK_VOICE)
+            stream = await get_tts_stream_async(
+                text, voice_id, fallback_voice=FALLBACK_VOICE, chunk_size=64 * 1024
+            )
         except Exception as exc:
             raise web.HTTPBadRequest(text=str(exc))
 
-        resp = web.StreamResponse(
-            status=200,
-            headers={
-                "Content-Type": "audio/mpeg",
-                "Cache-Control": "no-store",
-            },
-        )
-        await resp.prepare(request)
-
-        try:
-            while True:
-                chunk = await asyncio.to_thread(stream.read, 64 * 1024)
-                if not chunk:
-                    break
-                await resp.write(chunk)
-            await resp.write_eof()
-            with contextlib.suppress(Exception):
-                await producer_task
-        except (ConnectionResetError, asyncio.CancelledError):
-            stream.close()
-            producer_task.cancel()
-            with contextlib.suppress(Exception):
-                await producer_task
-        finally:
-            with contextlib.suppress(Exception):
-                stream.close()
+        # Previews are short (200 chars max), so send one buffered body instead of
+        # a chunked stream; a failed upstream also can't leave a cached partial clip.
+        audio = bytearray()
+        async with contextlib.aclosing(stream):
+            try:
+                async for chunk in stream:
+                    audio += chunk
+            except Exception as exc:
+                logger.warning("Voice preview stream error: %s", exc)
+                raise web.HTTPBadGateway(text=str(exc))
 
-        return resp
+        if stream.voice_id != voice_id:
+            # A fallback voice answered; don't let the browser keep it under this voice's ETag.
+            return web.Response(body=audio, content_type="audio/mpeg", headers={"Cache-Control": "no-store"})
+        return web.Response(body=audio, content_type="audio/mpeg", headers=cache_headers)
 
     async def api_logs(self, request: web.Request) -> web.Response:
-        tail = int(request.query.get("tail") or "500")
-        buffer = getattr(self.bot, "log_buffer", None)
-        lines = buffer.get_lines(tail=tail) if buffer else []
-        return web.json_response({"lines": lines})
+        resp = _json_response({"lines": self._log_buffer.get_lines(tail=_tail_param(request))})
+        # Log text is repetitive and polled often; gzip/deflate per Accept-Encoding.
+        resp.enable_compression()
+        return resp
 
     async def api_logs_stream(self, request: web.Request) -> web.StreamResponse:
-        buffer = getattr(self.bot, "log_buffer", None)
-        if buffer is None:
-            raise web.HTTPServiceUnavailable(text="Log buffer not configured")
-
-        sub = buffer.subscribe(tail=int(request.query.get("tail") or "500"))
-
-        resp = web.StreamResponse(
-            status=200,
-            headers={
-                "Content-Type": "text/event-stream",
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-            },
-        )
+        buffer = self._log_buffer
+
+        sub = buffer.subscribe(tail=_tail_param(request))
+
+        resp = web.StreamResponse(status=200, headers=_SSE_HEADERS)
         await resp.prepare(request)
 
         try:
-            for line in sub.initial_lines:
-                await resp.write(_sse_encode(line))
+            if sub.initial_lines:
+                await resp.write(_sse_encode(sub.initial_lines))
 
+            seq = sub.seq
             while True:
-                line = await sub.queue.get()
-                await resp.write(_sse_encode(line))
+                try:
+                    async with asyncio.timeout(SSE_HEARTBEAT_SECONDS):
+                        await buffer.wait(seq)
+                except TimeoutError:
+                    # Comment frame so idle proxies don't close the stream and force a reconnect.
+                    await resp.write(_SSE_HEARTBEAT)
+                    continue
+                # Everything appended since the last write goes out in one chunk.
+                lines, seq = buffer.lines_since(seq)
+                if lines:
+                    await resp.write(_sse_encode(lines))
         except (ConnectionResetError, asyncio.CancelledError):
             pass
-        finally:
-            buffer.unsubscribe(sub.queue)
 
         return resp
 
     async def api_settings_get(self, request: web.Request) -> web.Response:
-        guild_store = getattr(self.bot, "guild_settings", None)
+        guild_store = self._guild_store
         if guild_store is not None:
             raw_guild_id = (request.query.get("guild_id") or "").strip()
             if not raw_guild_id:
                 raise web.HTTPBadRequest(text="guild_id is required")
-            try:
-                guild_id = int(raw_guild_id)
-            except ValueError:
+            guild_id = _parse_id(raw_guild_id)
+            if guild_id is None:
                 raise web.HTTPBadRequest(text="guild_id must be an integer")
             if not self.bot.get_guild(guild_id):
                 raise web.HTTPNotFound(text="Unknown guild")
-            return web.json_response(await guild_store.get(guild_id))
 
-        store = getattr(self.bot, "settings", None)
-        if store is None:
-            return web.json_response({})
-        return web.json_response(await store.get())
+            version = guild_store.version(guild_id)
+            cached = self._settings_cache.get(guild_id)
+            if cached is not None and cached[0] == version:
+                self._settings_cache.move_to_end(guild_id)
+                return web.Response(body=cached[1], content_type="application/json", charset="utf-8")
+
+            body = _json_bytes(dict(await guild_store.get(guild_id)))
+            self._settings_cache[guild_id] = (version, body)
+            if len(self._settings_cache) > SETTINGS_CACHE_MAX:
+                self._settings_cache.popitem(last=False)
+            return web.Response(body=body, content_type="application/json", charset="utf-8")
+
+        return _json_response(await self._settings_store.get())
 
     async def api_settings_post(self, request: web.Request) -> web.Response:
-        guild_store = getattr(self.bot, "guild_settings", None)
+        guild_store = self._guild_store
         if guild_store is not None:
             raw_guild_id = (request.query.get("guild_id") or "").strip()
             if not raw_guild_id:
                 raise web.HTTPBadRequest(text="guild_id is required")
-            try:
-                guild_id = int(raw_guild_id)
-            except ValueError:
+            guild_id = _parse_id(raw_guild_id)
+            if guild_id is None:
                 raise web.HTTPBadRequest(text="guild_id must be an integer")
             if not self.bot.get_guild(guild_id):
                 raise web.HTTPNotFound(text="Unknown guild")
 
-            try:
-                payload: Dict[str, Any] = await request.json()
-            except json.JSONDecodeError:
-                raise web.HTTPBadRequest(text="Invalid JSON")
+            payload = await _read_json_object(request)
 
             try:
                 updated = await guild_store.update(guild_id, payload)
             except Exception as exc:
-                return web.json_response({"error": str(exc)}, status=400)
+                return _json_response({"error": str(exc)}, status=400)
 
-            return web.json_response(updated)
+            self._tts_settings_cache.pop(guild_id, None)
+            return _json_response(dict(updated))
 
-        store = getattr(self.bot, "settings", None)
-        if store is None:
-            raise web.HTTPServiceUnavailable(text="Settings store not configured")
+        payload = await _read_json_object(request)
 
         try:
-            payload: Dict[str, Any] = await request.json()
-        except json.JSONDecodeError:
-            raise web.HTTPBadRequest(text="Invalid JSON")
-
-        try:
-            updated = await store.update(payload)
+            updated = await self._settings_store.update(payload)
         except Exception as exc:
-            return web.json_response({"error": str(exc)}, status=400)
+            return _json_response({"error": str(exc)}, status=400)
 
-        return web.json_response(updated)
+        # Global settings apply to every guild.
+        self._tts_settings_cache.clear()
+        return _json_response(updated)
 
     async def api_tts_speak(self, request: web.Request) -> web.Response:
         """API endpoint for external bots to send TTS requests."""
         try:
-            payload: Dict[str, Any] = await request.json()
-        except json.JSONDecodeError:
+            payload: Dict[str, Any] = _json_loads(await request.read())
+        except ValueError:
             raise web.HTTPBadRequest(text="Invalid JSON")
 
         # Extract parameters
-        raw_guild_id = str(payload.get("guild_id", "")).strip()
+        raw_guild_id = _str_field(payload.get("guild_id"))
         if not raw_guild_id:
-            return web.json_response({"error": "guild_id is required"}, status=400)
+            return _json_response({"error": "guild_id is required"}, status=400)
 
-        try:
-            guild_id = int(raw_guild_id)
-        except ValueError:
-            return web.json_response({"error": "guild_id must be an integer"}, status=400)
+        guild_id = _parse_id(raw_guild_id)
+        if guild_id is None:
+            return _json_response({"error": "guild_id must be an integer"}, status=400)
 
         guild = self.bot.get_guild(guild_id)
         if not guild:
-            return web.json_response({"error": "Unknown guild or bot not in that server"}, status=404)
+            return _json_response({"error": "Unknown guild or bot not in that server"}, status=404)
 
-        text = str(payload.get("text", "")).strip()
+        text = _str_field(payload.get("text"))
         if not text:
-            return web.json_response({"error": "text is required"}, status=400)
+            return _json_response({"error": "text is required"}, status=400)
 
-        voice_id = str(payload.get("voice_id", "")).strip() or None
+        voice_id = _str_field(payload.get("voice_id")) or None
         channel_id = payload.get("channel_id")
 
         # Get the TTS cog
         tts_cog = self.bot.get_cog("TTSCog")
         if not tts_cog:
-            return web.json_response({"error": "TTS cog not loaded"}, status=500)
+            return _json_response({"error": "TTS cog not loaded"}, status=500)
 
         # Determine target channel
         target_channel = None
@@ -2155,41 +2954,37 @@ class WebUICog(commands.Cog):
         
         if channel_id:
             # Specific channel requested
-            try:
-                channel_id = int(channel_id)
-                target_channel = guild.get_channel(channel_id)
-                if not target_channel or not isinstance(target_channel, discord.VoiceChannel):
-                    return web.json_response({"error": "Invalid voice channel"}, status=400)
-            except (ValueError, TypeError):
-                return web.json_response({"error": "channel_id must be an integer"}, status=400)
+            channel_id = _parse_id(channel_id)
+            if channel_id is None:
+                return _json_response({"error": "channel_id must be an integer"}, status=400)
+            target_channel = guild.get_channel(channel_id)
+            if not target_channel or not isinstance(target_channel, discord.VoiceChannel):
+                return _json_response({"error": "Invalid voice channel"}, status=400)
         else:
             # Check if bot is already connected to a channel in this guild
             if state.voice_client and state.voice_client.is_connected():
                 target_channel = state.voice_client.channel
             else:
                 # Try to find any voice channel with members
-                for channel in guild.voice_channels:
-                    if len(channel.members) > 0:
-                        target_channel = channel
-                        break
+                target_channel = self._find_populated_voice_channel(guild)
                 
                 if not target_channel:
-                    return web.json_response(
+                    return _json_response(
                         {"error": "Bot is not in a voice channel. Join a voice channel first or specify channel_id"},
                         status=400
                     )
 
         # Ensure bot is connected (will use existing connection if already in that channel)
-        ok = await tts_cog.ensure_connected(guild, target_channel)
+        ok = _connected_to(state, target_channel) or await tts_cog.ensure_connected(guild, target_channel)
         if not ok:
             locked_id = state.voice_channel_id
             msg = "Bot is currently locked to another voice channel"
             if locked_id:
                 msg = f"Bot is locked to channel {locked_id}"
-            return web.json_response({"error": msg}, status=409)
+            return _json_response({"error": msg}, status=409)
 
         # Get settings and determine voice
-        settings = await tts_cog.get_settings(guild_id)
+        settings = await self._get_settings_cached(tts_cog, guild_id)
         if voice_id:
             voice_id = tts_cog._effective_voice_id(settings, voice_id, allow_default=True)
         else:
@@ -2198,10 +2993,9 @@ class WebUICog(commands.Cog):
 
         # Queue the TTS
         state = tts_cog.get_state(guild_id)
-        from cogs.tts import QueueItem
         await state.queue.put(QueueItem(text=text, voice_id=voice_id))
 
-        return web.json_response({
+        return _json_response({
             "success": True,
             "message": "TTS queued successfully",
             "guild_id": str(guild_id),
@@ -2211,80 +3005,72 @@ class WebUICog(commands.Cog):
 
     async def ws_tts(self, request: web.Request) -> web.StreamResponse:
         if self._token_required:
-            token = _get_bearer_token(request)
-            if token != self.token:
-                return web.json_response({"error": "unauthorized"}, status=401)
+            if not _token_matches(_get_bearer_token(request), self._token_bytes):
+                return _json_response({"error": "unauthorized"}, status=401)
 
         ws = web.WebSocketResponse(heartbeat=20, receive_timeout=60)
         await ws.prepare(request)
 
+        # Runs inside the TaskGroup below, so it must not raise: a failing child
+        # would cancel the receive loop too.
         async def stream_tts(text: str, voice_id: Optional[str]) -> None:
             requested_voice = (voice_id or "").strip() or FALLBACK_VOICE
-            if requested_voice not in ALL_VOICE_IDS:
-                await ws.send_json({"event": "error", "error": f"Unknown voice_id: {requested_voice}"})
+            if requested_voice not in ALL_VOICE_IDS_SET:
+                with contextlib.suppress(ConnectionResetError):
+                    await ws.send_json({"event": "error", "error": f"Unknown voice_id: {requested_voice}"}, dumps=_json_dumps)
                 return
 
             try:
-                stream, producer_task = await get_tts_stream(text, requested_voice)
+                stream = await get_tts_stream_async(text, requested_voice)
             except Exception as exc:
                 logger.warning("WebSocket TTS stream failed to start: %s", exc)
-                await ws.send_json({"event": "error", "error": str(exc)})
+                with contextlib.suppress(ConnectionResetError):
+                    await ws.send_json({"event": "error", "error": str(exc)}, dumps=_json_dumps)
                 return
 
-            await ws.send_json({"event": "start", "voice_id": requested_voice, "format": "mp3"})
+            async with contextlib.aclosing(stream):
+                try:
+                    await ws.send_json({"event": "start", "voice_id": requested_voice, "format": "mp3"}, dumps=_json_dumps)
+                    async for chunk in stream:
+                        await ws.send_bytes(chunk)
+                    await ws.send_json({"event": "end"}, dumps=_json_dumps)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    logger.warning("WebSocket TTS stream error: %s", exc)
+                    with contextlib.suppress(Exception):
+                        await ws.send_json({"event": "error", "error": str(exc)}, dumps=_json_dumps)
 
+        current: Optional[asyncio.Task] = None
+        async with asyncio.TaskGroup() as tg:
             try:
-                while True:
-                    chunk = await asyncio.to_thread(stream.read, 4096)
-                    if not chunk:
+                async for msg in ws:
+                    if msg.type == web.WSMsgType.TEXT:
+                        try:
+                            payload = _json_loads(msg.data)
+                        except ValueError:
+                            await ws.send_json({"event": "error", "error": "Invalid JSON"}, dumps=_json_dumps)
+                            continue
+
+                        text = _str_field(payload.get("text"))
+                        voice_id = _str_field(payload.get("voice_id")) or None
+                        if not text:
+                            await ws.send_json({"event": "error", "error": "text is required"}, dumps=_json_dumps)
+                            continue
+
+                        # A new request replaces the one in flight; the group reaps it.
+                        if current is not None:
+                            current.cancel()
+                        current = tg.create_task(stream_tts(text, voice_id))
+                    elif msg.type == web.WSMsgType.ERROR:
+                        logger.warning("WebSocket connection error: %s", ws.exception())
+                        break
+                    elif msg.type in (web.WSMsgType.CLOSE, web.WSMsgType.CLOSING, web.WSMsgType.CLOSED):
                         break
-                    await ws.send_bytes(chunk)
-                await producer_task
-                await ws.send_json({"event": "end"})
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                logger.warning("WebSocket TTS stream error: %s", exc)
-                with contextlib.suppress(Exception):
-                    await ws.send_json({"event": "error", "error": str(exc)})
             finally:
-                if not producer_task.done():
-                    producer_task.cancel()
-                    with contextlib.suppress(Exception):
-                        await producer_task
-
-        in_flight: Optional[asyncio.Task] = None
-        try:
-            async for msg in ws:
-                if msg.type == web.WSMsgType.TEXT:
-                    try:
-                        payload = json.loads(msg.data)
-                    except json.JSONDecodeError:
-                        await ws.send_json({"event": "error", "error": "Invalid JSON"})
-                        continue
-
-                    text = str(payload.get("text", "")).strip()
-                    voice_id = str(payload.get("voice_id", "")).strip() or None
-                    if not text:
-                        await ws.send_json({"event": "error", "error": "text is required"})
-                        continue
-
-                    if in_flight and not in_flight.done():
-                        in_flight.cancel()
-                        with contextlib.suppress(Exception):
-                            await in_flight
-
-                    in_flight = asyncio.create_task(stream_tts(text, voice_id))
-                elif msg.type == web.WSMsgType.ERROR:
-                    logger.warning("WebSocket connection error: %s", ws.exception())
-                    break
-                elif msg.type in (web.WSMsgType.CLOSE, web.WSMsgType.CLOSING, web.WSMsgType.CLOSED):
-                    break
-        finally:
-            if in_flight and not in_flight.done():
-                in_flight.cancel()
-                with contextlib.suppress(Exception):
-                    await in_flight
+                # The group waits for children on exit; stop the stream instead.
+                if current is not None:
+                    current.cancel()
 
         return ws
 
@@ -0,0 +1,26 @@
+import pytest
+
+from utils.settings_schema import DEFAULT_SETTINGS, validate_settings_cached
+
+
+def test_cached_view_is_shared_but_immutable():
+    first = validate_settings_cached(DEFAULT_SETTINGS)
+    assert validate_settings_cached(dict(DEFAULT_SETTINGS)) is first
+    assert isinstance(first["allowed_voice_ids"], tuple)
+    assert isinstance(first["allowlist_text_channel_ids"], tuple)
+    with pytest.raises(TypeError):
+        first["max_tts_chars"] = 1
+    with pytest.raises(AttributeError):
+        first["allowed_voice_ids"].clear()
+
+
+def test_mutating_a_copy_does_not_poison_the_cache():
+    expected = list(validate_settings_cached(DEFAULT_SETTINGS)["allowed_voice_ids"])
+    assert expected
+
+    # Callers take shallow copies; editing the copy must not reach the cached view.
+    copy = dict(validate_settings_cached(DEFAULT_SETTINGS))
+    copy["allowed_voice_ids"] = list(copy["allowed_voice_ids"])
+    copy["allowed_voice_ids"].clear()
+
+    assert list(validate_settings_cached(DEFAULT_SETTINGS)["allowed_voice_ids"]) == expected
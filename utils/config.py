@@ -1,4 +1,6 @@
 import os
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 COMMAND_PREFIX = "!"
 MAX_TTS_CHARS = 300
@@ -7,29 +9,37 @@ VOICE_FAILURE_THRESHOLD = 3
 VOICE_COOLDOWN_DURATION = 300
 
 
-def _env_int(name: str, default: int) -> int:
+def _parse_int(raw: Optional[str], default: int) -> int:
+    # Unset and blank skip the exception; everything else parses exactly as int() does.
+    if not raw or raw.isspace():
+        return default
     try:
-        return int(os.getenv(name, "").strip() or default)
+        return int(raw.strip())
     except ValueError:
         return default
 
 
-def _env_float(name: str, default: float) -> float:
+def _parse_float(raw: Optional[str], default: float) -> float:
+    if not raw or raw.isspace():
+        return default
     try:
-        return float(os.getenv(name, "").strip() or default)
+        return float(raw.strip())
     except ValueError:
         return default
 
 
-def _env_bool(name: str, default: bool) -> bool:
-    raw = os.getenv(name)
+# Strings read as "true" by env vars, query params and settings values.
+TRUTHY_STRINGS: frozenset[str] = frozenset(("1", "true", "yes", "y", "on"))
+
+
+def _parse_bool(raw: Optional[str], default: bool) -> bool:
     if raw is None:
         return default
-    return raw.strip().lower() in {"1", "true", "yes", "y", "on"}
+    return raw.strip().lower() in TRUTHY_STRINGS
 
 
-def _env_int_list(name: str) -> list[int]:
-    raw = os.getenv(name, "").strip()
+def _parse_int_list(raw: Optional[str]) -> list[int]:
+    raw = (raw or "").strip()
     if not raw:
         return []
     values: list[int] = []
@@ -44,8 +54,24 @@ def _env_int_list(name: str) -> list[int]:
     return values
 
 
+def _env_int(name: str, default: int) -> int:
+    return _parse_int(os.getenv(name), default)
+
+
+def _env_float(name: str, default: float) -> float:
+    return _parse_float(os.getenv(name), default)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return _parse_bool(os.getenv(name), default)
+
+
+def _env_int_list(name: str) -> list[int]:
+    return _parse_int_list(os.getenv(name))
+
+
 QUEUE_MAXSIZE = _env_int("QUEUE_MAXSIZE", 100)
-DROP_POLICY = os.getenv("DROP_POLICY", "drop_oldest").strip().lower() or "drop_oldest"
+DROP_POLICY = (os.getenv("DROP_POLICY") or "drop_oldest").strip().lower() or "drop_oldest"
 COALESCE_MS = _env_int("COALESCE_MS", 500)
 COALESCE_SAME_SPEAKER_ONLY = _env_bool("COALESCE_SAME_SPEAKER_ONLY", True)
 MAX_MESSAGE_CHARS = _env_int("MAX_MESSAGE_CHARS", 350)
@@ -57,13 +83,17 @@ STUCK_SECONDS = _env_float("STUCK_SECONDS", 45.0)
 SKIP_SUMMARY_ENABLED = _env_bool("SKIP_SUMMARY_ENABLED", True)
 GLOBAL_ALLOWLIST_TEXT_CHANNEL_IDS = _env_int_list("ALLOWLIST_TEXT_CHANNEL_IDS")
 TTS_HTTP_TIMEOUT = _env_float("TTS_HTTP_TIMEOUT", 20.0)
+DJ_BATCH_WINDOW_MS = _env_int("DJ_BATCH_WINDOW_MS", 25)
+DJ_BATCH_MAX = _env_int("DJ_BATCH_MAX", 8)
+SQLITE_MMAP_MB = _env_int("SQLITE_MMAP_MB", 256)
+USER_CACHE_MAX = _env_int("USER_CACHE_MAX", 10000)
 
 TIKTOK_TTS_URL = "https://tiktok-tts.weilnet.workers.dev/api/generation"
 GOOGLE_TTS_URL = "https://translate.google.com/translate_tts"
 USER_AGENT = "Mozilla/5.0"
 
 # Voice options ported from `js-bot/src/config.js` for `/voice` autocomplete.
-TIKTOK_VOICES: list[tuple[str, str]] = [
+TIKTOK_VOICES: tuple[tuple[str, str], ...] = (
     # Disney Characters
     ("en_us_ghostface", "Ghost Face"),
     ("en_us_c3po", "C3PO"),
@@ -107,17 +137,23 @@ TIKTOK_VOICES: list[tuple[str, str]] = [
     ("en_au_001", "Metro"),
     ("en_au_002", "Smooth"),
     ("es_mx_002", "Warm"),
-]
+)
 
-GOOGLE_VOICES: list[tuple[str, str]] = [
+GOOGLE_VOICES: tuple[tuple[str, str], ...] = (
     ("google_translate", "Normal voice"),
-]
-
-ALL_VOICES: list[tuple[str, str]] = [*TIKTOK_VOICES, *GOOGLE_VOICES]
-ALL_VOICE_IDS: list[str] = [voice_id for voice_id, _name in ALL_VOICES]
-VOICE_ID_TO_NAME: dict[str, str] = {voice_id: name for voice_id, name in ALL_VOICES}
-
-POPULAR_VOICE_IDS: list[str] = [
+)
+
+# Voice tables are fixed at import time; tuples and a read-only mapping keep them that way.
+ALL_VOICES: tuple[tuple[str, str], ...] = (*TIKTOK_VOICES, *GOOGLE_VOICES)
+ALL_VOICE_IDS: tuple[str, ...] = tuple(voice_id for voice_id, _name in ALL_VOICES)
+ALL_VOICE_IDS_SET: frozenset[str] = frozenset(ALL_VOICE_IDS)
+VOICE_ID_TO_NAME: Mapping[str, str] = MappingProxyType({voice_id: name for voice_id, name in ALL_VOICES})
+# (voice_id, lowercased "voice_id name") pairs so autocomplete matches without lowering per keystroke.
+VOICE_SEARCH_KEYS: tuple[tuple[str, str], ...] = tuple(
+    (voice_id, f"{voice_id} {name}".lower()) for voice_id, name in VOICE_ID_TO_NAME.items()
+)
+
+POPULAR_VOICE_IDS: tuple[str, ...] = (
     "en_us_001",
     "en_us_ghostface",
     "en_us_002",
@@ -143,4 +179,4 @@ POPULAR_VOICE_IDS: list[str] = [
     "en_uk_001",
     "en_au_001",
     "google_translate",
-]
+)
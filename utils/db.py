@@ -1,25 +1,252 @@
-import json
+import asyncio
+import functools
 import os
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Optional
 
 import aiosqlite
 
-from .settings_schema import DEFAULT_SETTINGS, validate_settings
+from .config import SQLITE_MMAP_MB, USER_CACHE_MAX
+from .logger import get_logger
+from .settings_schema import DEFAULT_SETTINGS, validate_settings_cached
+
+try:  # Optional: orjson parses the stored id lists several times faster.
+    import orjson
+except ImportError:
+    import json
+
+    orjson = None
+
+logger = get_logger("db")
+
+# Seconds to hold a write before committing, so bursts share one transaction.
+COMMIT_DELAY = 0.05
+# Stored in PRAGMA user_version once the tables and columns below exist; bump when adding a migration.
+_SCHEMA_VERSION = 3
+
+# Bits in discord_users.flags; new per-user booleans take the next bit instead of a new column.
+USER_FLAG_AUTO_JOIN = 1
+
+_SQL_TABLE_EXISTS = "SELECT 1 FROM sqlite_master WHERE type='table' AND name = ? LIMIT 1;"
+
+_SQL_MIGRATE_USER_VOICES = """
+INSERT INTO discord_users(discord_id, display_name, voice_id, updated_at)
+SELECT discord_id, '' AS display_name, voice_id, updated_at
+FROM user_voices
+ON CONFLICT(discord_id) DO UPDATE SET
+    voice_id=excluded.voice_id,
+    updated_at=excluded.updated_at;
+"""
+
+_SQL_GET_MEMBER_LAST_SEEN = "SELECT last_seen_date FROM member_seen WHERE guild_id = ? AND user_id = ?;"
+
+_SQL_UPSERT_MEMBER_LAST_SEEN = """
+INSERT INTO member_seen(guild_id, user_id, last_seen_date, updated_at)
+VALUES(?, ?, ?, ?)
+ON CONFLICT(guild_id, user_id) DO UPDATE SET
+    last_seen_date=excluded.last_seen_date,
+    updated_at=excluded.updated_at;
+"""
+
+_SQL_UPSERT_USER = """
+INSERT INTO discord_users(discord_id, display_name, voice_id, updated_at)
+VALUES(?, ?, NULL, ?)
+ON CONFLICT(discord_id) DO UPDATE SET
+    display_name=excluded.display_name,
+    updated_at=excluded.updated_at;
+"""
+
+_SQL_GET_USER_VOICE = "SELECT voice_id FROM discord_users WHERE discord_id = ?"
+
+_SQL_GET_USER_NICKNAME = "SELECT nickname FROM discord_users WHERE discord_id = ?"
+
+_SQL_GET_USER_FLAGS = "SELECT flags FROM discord_users WHERE discord_id = ?"
+
+_SQL_SET_USER_VOICE = """
+INSERT INTO discord_users(discord_id, display_name, voice_id, updated_at)
+VALUES(?, ?, ?, ?)
+ON CONFLICT(discord_id) DO UPDATE SET
+    display_name=excluded.display_name,
+    voice_id=excluded.voice_id,
+    updated_at=excluded.updated_at;
+"""
+
+_SQL_SET_USER_NICKNAME = """
+INSERT INTO discord_users(discord_id, display_name, nickname, updated_at)
+VALUES(?, ?, ?, ?)
+ON CONFLICT(discord_id) DO UPDATE SET
+    display_name=excluded.display_name,
+    nickname=excluded.nickname,
+    updated_at=excluded.updated_at;
+"""
+
+# Binds (discord_id, display_name, bit, bit_value, updated_at); only `bit` of flags changes.
+_SQL_SET_USER_FLAG = """
+INSERT INTO discord_users(discord_id, display_name, flags, updated_at)
+VALUES(?1, ?2, ?4, ?5)
+ON CONFLICT(discord_id) DO UPDATE SET
+    display_name=excluded.display_name,
+    flags=(flags & ~?3) | ?4,
+    updated_at=excluded.updated_at;
+"""
+
+_SQL_DELETE_USER_VOICE = "UPDATE discord_users SET voice_id = NULL, updated_at = ? WHERE discord_id = ?"
+
+_SQL_REPLACE_USER_VOICE = "UPDATE discord_users SET voice_id = ?, updated_at = ? WHERE voice_id = ?"
+
+_SQL_DELETE_USER_NICKNAME = "UPDATE discord_users SET nickname = NULL, updated_at = ? WHERE discord_id = ?"
+
+_GUILD_SETTINGS_COLUMNS = """
+    max_tts_chars, fallback_voice, default_voice_id,
+    auto_read_messages, leave_when_alone,
+    greet_on_join, farewell_on_leave,
+    restrict_voices, allowed_voice_ids,
+    allowlist_text_channel_ids
+"""
+
+_SQL_GET_GUILD_SETTINGS = f"SELECT {_GUILD_SETTINGS_COLUMNS} FROM guild_settings WHERE guild_id = ?"
+
+# Guild ids bound per IN (...) query; stays under the 999-variable limit of older SQLite builds.
+GUILD_SETTINGS_BATCH = 500
+
+_SQL_ENSURE_GUILD_SETTINGS = """
+INSERT INTO guild_settings(
+    guild_id, max_tts_chars, fallback_voice, default_voice_id,
+    auto_read_messages, leave_when_alone,
+    greet_on_join, farewell_on_leave,
+    restrict_voices, allowed_voice_ids,
+    allowlist_text_channel_ids,
+    updated_at
+)
+VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(guild_id) DO NOTHING;
+"""
+
+_SQL_UPSERT_GUILD_SETTINGS = """
+INSERT INTO guild_settings(
+    guild_id, max_tts_chars, fallback_voice, default_voice_id,
+    auto_read_messages, leave_when_alone,
+    greet_on_join, farewell_on_leave,
+    restrict_voices, allowed_voice_ids,
+    allowlist_text_channel_ids,
+    updated_at
+)
+VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(guild_id) DO UPDATE SET
+    max_tts_chars=excluded.max_tts_chars,
+    fallback_voice=excluded.fallback_voice,
+    default_voice_id=excluded.default_voice_id,
+    auto_read_messages=excluded.auto_read_messages,
+    leave_when_alone=excluded.leave_when_alone,
+    greet_on_join=excluded.greet_on_join,
+    farewell_on_leave=excluded.farewell_on_leave,
+    restrict_voices=excluded.restrict_voices,
+    allowed_voice_ids=excluded.allowed_voice_ids,
+    allowlist_text_channel_ids=excluded.allowlist_text_channel_ids,
+    updated_at=excluded.updated_at;
+"""
+
+
+@functools.lru_cache(maxsize=16)
+def _ensure_dir(path: str) -> None:
+    # Reconnects to the same file skip the stat/mkdir once the directory is known to exist.
+    Path(path or ".").mkdir(parents=True, exist_ok=True)
+
+
+def _dumps_ids(values: Any) -> str:
+    # Settings are saved far more often than the id lists change, so reuse the encoded text.
+    return _dumps_id_tuple(tuple(values or ()))
+
+
+@functools.lru_cache(maxsize=1024)
+def _dumps_id_tuple(values: tuple[Any, ...]) -> str:
+    if orjson is not None:
+        return orjson.dumps(values).decode("utf-8")
+    return json.dumps(values)
+
+
+def _loads_ids(raw: Any) -> Any:
+    # Both parsers accept str and bytes; anything unparsable reads as an empty list.
+    try:
+        if orjson is not None:
+            return orjson.loads(raw or "[]")
+        return json.loads(raw or "[]")
+    except Exception:
+        return []
+
+
+def _cache_get(cache: "OrderedDict[int, Any]", key: int) -> Any:
+    # Raises KeyError on a miss, like the dict lookup it replaces.
+    value = cache[key]
+    cache.move_to_end(key)
+    return value
+
+
+def _cache_put(cache: "OrderedDict[int, Any]", key: int, value: Any) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > USER_CACHE_MAX:
+        cache.popitem(last=False)
+
+
+def _guild_settings_from_row(row: Any) -> dict[str, Any]:
+    raw = {
+        "max_tts_chars": row[0],
+        "fallback_voice": row[1],
+        "default_voice_id": row[2],
+        "auto_read_messages": bool(row[3]),
+        "leave_when_alone": bool(row[4]),
+        "greet_on_join": bool(row[5]),
+        "farewell_on_leave": bool(row[6]),
+        "restrict_voices": bool(row[7]),
+        "allowed_voice_ids": _loads_ids(row[8]),
+        "allowlist_text_channel_ids": _loads_ids(row[9]),
+    }
+    # Many guilds share the same stored settings, so most rows are cache hits.
+    return dict(validate_settings_cached(raw))
 
 
 class Database:
     def __init__(self, path: str) -> None:
         self.path = path
+        self._dir = os.path.dirname(path)
         self._conn: aiosqlite.Connection | None = None
+        self._dirty = False
+        self._commit_task: Optional[asyncio.Task] = None
+        # Read-through LRU caches for the per-message user lookups, USER_CACHE_MAX entries each;
+        # the mutators below keep them current.
+        self._user_voice_cache: "OrderedDict[int, Optional[str]]" = OrderedDict()
+        self._user_nick_cache: "OrderedDict[int, Optional[str]]" = OrderedDict()
+        self._user_autojoin_cache: "OrderedDict[int, bool]" = OrderedDict()
 
     async def connect(self) -> None:
         if self._conn is not None:
             return
-        Path(os.path.dirname(self.path) or ".").mkdir(parents=True, exist_ok=True)
-        self._conn = await aiosqlite.connect(self.path)
+        _ensure_dir(self._dir)
+        # Statements are module-level constants; keep all of them in sqlite3's statement cache.
+        self._conn = await aiosqlite.connect(self.path, cached_statements=256)
         await self._conn.execute("PRAGMA journal_mode=WAL;")
         await self._conn.execute("PRAGMA busy_timeout=5000;")
+        # With WAL, NORMAL only syncs at checkpoints and stays corruption-safe.
+        await self._conn.execute("PRAGMA synchronous=NORMAL;")
+        # Hot reads come straight from mapped pages; SQLITE_MMAP_MB=0 turns this off where mmap misbehaves.
+        await self._conn.execute(f"PRAGMA mmap_size={max(0, SQLITE_MMAP_MB) * 1024 * 1024};")
+        await self._conn.execute("PRAGMA cache_size=-20000;")
+        await self._conn.execute("PRAGMA temp_store=MEMORY;")
+        # Databases already at _SCHEMA_VERSION skip the table/column introspection entirely.
+        async with self._conn.execute("PRAGMA user_version;") as cursor:
+            (version,) = await cursor.fetchone()
+        if version < _SCHEMA_VERSION:
+            # One transaction, so a crash mid-upgrade never leaves a half-migrated schema.
+            await self._conn.execute("BEGIN;")
+            await self._create_schema()
+            await self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION};")
+            await self._conn.commit()
+
+    async def _create_schema(self) -> None:
+        if self._conn is None:
+            raise RuntimeError("Database not connected")
         await self._conn.execute(
             """
             CREATE TABLE IF NOT EXISTS discord_users (
@@ -28,6 +255,7 @@ class Database:
                 nickname TEXT NULL,
                 voice_id TEXT NULL,
                 auto_join INTEGER NOT NULL DEFAULT 0,
+                flags INTEGER NOT NULL DEFAULT 0,
                 updated_at INTEGER NOT NULL
             );
             """
@@ -63,22 +291,61 @@ class Database:
         )
         await self._ensure_user_columns()
         await self._ensure_guild_settings_columns()
+        # replace_user_voices matches on voice_id; without this it scans every user row.
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_discord_users_voice_id ON discord_users(voice_id);"
+        )
         await self._migrate_from_user_voices()
-        await self._conn.commit()
 
     async def close(self) -> None:
         if self._conn is None:
             return
-        await self._conn.close()
-        self._conn = None
+        if self._commit_task is not None:
+            self._commit_task.cancel()
+            self._commit_task = None
+        try:
+            await self.flush()
+        finally:
+            await self._conn.close()
+            self._conn = None
+
+    def _schedule_commit(self) -> None:
+        # Writes within COMMIT_DELAY share one commit (and one fsync) instead of one each.
+        self._dirty = True
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self._commit_later())
+
+    async def _commit_later(self) -> None:
+        # Loop so writes that land while a commit is in flight aren't left pending.
+        while self._dirty:
+            await asyncio.sleep(COMMIT_DELAY)
+            try:
+                await self.flush()
+            except Exception:
+                # The writes stay pending; the next write or `flush` retries the commit.
+                logger.exception("Failed to commit database %s", self.path)
+                return
 
-    async def _table_exists(self, table_name: str) -> bool:
+    async def flush(self) -> None:
+        """Commit pending writes now, raising if the commit fails."""
+        if self._conn is None or not self._dirty:
+            return
+        self._dirty = False
+        try:
+            await self._conn.commit()
+        except BaseException:
+            self._dirty = True
+            raise
+
+    async def _fetchone(self, sql: str, params: tuple[Any, ...]) -> Optional[tuple[Any, ...]]:
+        # execute_fetchall is one worker-thread hop; execute/fetchone/close on a cursor is three.
         if self._conn is None:
             raise RuntimeError("Database not connected")
-        async with self._conn.execute(
-            "SELECT 1 FROM sqlite_master WHERE type='table' AND name = ? LIMIT 1;", (table_name,)
-        ) as cursor:
-            return await cursor.fetchone() is not None
+        rows = await self._conn.execute_fetchall(sql, params)
+        return rows[0] if rows else None
+
+    async def _table_exists(self, table_name: str) -> bool:
+        return await self._fetchone(_SQL_TABLE_EXISTS, (table_name,)) is not None
 
     async def _migrate_from_user_voices(self) -> None:
         # Older schema used `user_voices(discord_id, voice_id, updated_at)`.
@@ -88,16 +355,7 @@ class Database:
         if not await self._table_exists("user_voices"):
             return
 
-        await self._conn.execute(
-            """
-            INSERT INTO discord_users(discord_id, display_name, voice_id, updated_at)
-            SELECT discord_id, '' AS display_name, voice_id, updated_at
-            FROM user_voices
-            ON CONFLICT(discord_id) DO UPDATE SET
-                voice_id=excluded.voice_id,
-                updated_at=excluded.updated_at;
-            """
-        )
+        await self._conn.execute(_SQL_MIGRATE_USER_VOICES)
 
     async def _ensure_user_columns(self) -> None:
         """Ensure schema is upgraded in-place for existing DBs."""
@@ -105,8 +363,10 @@ class Database:
         if self._conn is None:
             raise RuntimeError("Database not connected")
 
+        # One fetchall round-trip; async iteration pulls each row through the worker thread.
         async with self._conn.execute("PRAGMA table_info(discord_users);") as cursor:
-            cols = {row[1] async for row in cursor}
+            rows = await cursor.fetchall()
+        cols = {row[1] for row in rows}
 
         # Add `nickname` if upgrading from an older schema.
         if "nickname" not in cols:
@@ -115,6 +375,12 @@ class Database:
             await self._conn.execute(
                 "ALTER TABLE discord_users ADD COLUMN auto_join INTEGER NOT NULL DEFAULT 0;"
             )
+        if "flags" not in cols:
+            await self._conn.execute("ALTER TABLE discord_users ADD COLUMN flags INTEGER NOT NULL DEFAULT 0;")
+            # auto_join is no longer written; carry existing values into their flag bit once.
+            await self._conn.execute(
+                f"UPDATE discord_users SET flags = flags | {USER_FLAG_AUTO_JOIN} WHERE auto_join != 0;"
+            )
 
     async def _ensure_guild_settings_columns(self) -> None:
         """Ensure guild settings schema is upgraded in-place for existing DBs."""
@@ -123,7 +389,8 @@ class Database:
             raise RuntimeError("Database not connected")
 
         async with self._conn.execute("PRAGMA table_info(guild_settings);") as cursor:
-            cols = {row[1] async for row in cursor}
+            rows = await cursor.fetchall()
+        cols = {row[1] for row in rows}
 
         if "greet_on_join" not in cols:
             await self._conn.execute(
@@ -149,223 +416,166 @@ class Database:
     async def get_member_last_seen(self, guild_id: int, user_id: int) -> Optional[str]:
         if self._conn is None:
             raise RuntimeError("Database not connected")
-        async with self._conn.execute(
-            "SELECT last_seen_date FROM member_seen WHERE guild_id = ? AND user_id = ?;",
-            (guild_id, user_id),
-        ) as cursor:
-            row = await cursor.fetchone()
-            return row[0] if row else None
+        row = await self._fetchone(_SQL_GET_MEMBER_LAST_SEEN, (guild_id, user_id))
+        return row[0] if row else None
 
     async def upsert_member_last_seen(self, guild_id: int, user_id: int, last_seen_date: str, updated_at: int) -> None:
         if self._conn is None:
             raise RuntimeError("Database not connected")
         await self._conn.execute(
-            """
-            INSERT INTO member_seen(guild_id, user_id, last_seen_date, updated_at)
-            VALUES(?, ?, ?, ?)
-            ON CONFLICT(guild_id, user_id) DO UPDATE SET
-                last_seen_date=excluded.last_seen_date,
-                updated_at=excluded.updated_at;
-            """,
+            _SQL_UPSERT_MEMBER_LAST_SEEN,
             (guild_id, user_id, last_seen_date, updated_at),
         )
-        await self._conn.commit()
+        self._schedule_commit()
 
     async def upsert_user(self, discord_id: int, display_name: str, updated_at: int) -> None:
         if self._conn is None:
             raise RuntimeError("Database not connected")
         await self._conn.execute(
-            """
-            INSERT INTO discord_users(discord_id, display_name, voice_id, updated_at)
-            VALUES(?, ?, NULL, ?)
-            ON CONFLICT(discord_id) DO UPDATE SET
-                display_name=excluded.display_name,
-                updated_at=excluded.updated_at;
-            """,
+            _SQL_UPSERT_USER,
             (discord_id, display_name, updated_at),
         )
-        await self._conn.commit()
+        self._schedule_commit()
 
     async def get_user_voice(self, discord_id: int) -> Optional[str]:
+        try:
+            return _cache_get(self._user_voice_cache, discord_id)
+        except KeyError:
+            pass
         if self._conn is None:
             raise RuntimeError("Database not connected")
-        async with self._conn.execute(
-            "SELECT voice_id FROM discord_users WHERE discord_id = ?", (discord_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return None
-            voice_id = row[0]
-            return str(voice_id) if voice_id else None
+        row = await self._fetchone(_SQL_GET_USER_VOICE, (discord_id,))
+        # TEXT affinity: the column only ever holds str or NULL, so no str() coercion is needed.
+        voice_id = row[0] if row and row[0] else None
+        _cache_put(self._user_voice_cache, discord_id, voice_id)
+        return voice_id
 
     async def get_user_nickname(self, discord_id: int) -> Optional[str]:
+        try:
+            return _cache_get(self._user_nick_cache, discord_id)
+        except KeyError:
+            pass
         if self._conn is None:
             raise RuntimeError("Database not connected")
-        async with self._conn.execute(
-            "SELECT nickname FROM discord_users WHERE discord_id = ?", (discord_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return None
-            nickname = row[0]
-            nickname = str(nickname) if nickname else None
-            if nickname:
-                nickname = nickname.strip()
-            return nickname or None
+        row = await self._fetchone(_SQL_GET_USER_NICKNAME, (discord_id,))
+        nickname = (row[0].strip() or None) if row and row[0] else None
+        _cache_put(self._user_nick_cache, discord_id, nickname)
+        return nickname
 
     async def get_user_auto_join(self, discord_id: int) -> bool:
+        try:
+            return _cache_get(self._user_autojoin_cache, discord_id)
+        except KeyError:
+            pass
         if self._conn is None:
             raise RuntimeError("Database not connected")
-        async with self._conn.execute(
-            "SELECT auto_join FROM discord_users WHERE discord_id = ?", (discord_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            return bool(row and row[0])
+        row = await self._fetchone(_SQL_GET_USER_FLAGS, (discord_id,))
+        auto_join = bool(row and row[0] & USER_FLAG_AUTO_JOIN)
+        _cache_put(self._user_autojoin_cache, discord_id, auto_join)
+        return auto_join
 
     async def set_user_voice(self, discord_id: int, display_name: str, voice_id: str, updated_at: int) -> None:
         if self._conn is None:
             raise RuntimeError("Database not connected")
         await self._conn.execute(
-            """
-            INSERT INTO discord_users(discord_id, display_name, voice_id, updated_at)
-            VALUES(?, ?, ?, ?)
-            ON CONFLICT(discord_id) DO UPDATE SET
-                display_name=excluded.display_name,
-                voice_id=excluded.voice_id,
-                updated_at=excluded.updated_at;
-            """,
+            _SQL_SET_USER_VOICE,
             (discord_id, display_name, voice_id, updated_at),
         )
-        await self._conn.commit()
+        self._user_voice_cache.pop(discord_id, None)
+        self._schedule_commit()
 
     async def set_user_nickname(self, discord_id: int, display_name: str, nickname: str, updated_at: int) -> None:
         if self._conn is None:
             raise RuntimeError("Database not connected")
         await self._conn.execute(
-            """
-            INSERT INTO discord_users(discord_id, display_name, nickname, updated_at)
-            VALUES(?, ?, ?, ?)
-            ON CONFLICT(discord_id) DO UPDATE SET
-                display_name=excluded.display_name,
-                nickname=excluded.nickname,
-                updated_at=excluded.updated_at;
-            """,
+            _SQL_SET_USER_NICKNAME,
             (discord_id, display_name, nickname, updated_at),
         )
-        await self._conn.commit()
+        self._user_nick_cache.pop(discord_id, None)
+        self._schedule_commit()
 
     async def set_user_auto_join(self, discord_id: int, display_name: str, auto_join: bool, updated_at: int) -> None:
         if self._conn is None:
             raise RuntimeError("Database not connected")
         await self._conn.execute(
-            """
-            INSERT INTO discord_users(discord_id, display_name, auto_join, updated_at)
-            VALUES(?, ?, ?, ?)
-            ON CONFLICT(discord_id) DO UPDATE SET
-                display_name=excluded.display_name,
-                auto_join=excluded.auto_join,
-                updated_at=excluded.updated_at;
-            """,
-            (discord_id, display_name, 1 if auto_join else 0, updated_at),
+            _SQL_SET_USER_FLAG,
+            (
+                discord_id,
+                display_name,
+                USER_FLAG_AUTO_JOIN,
+                USER_FLAG_AUTO_JOIN if auto_join else 0,
+                updated_at,
+            ),
         )
-        await self._conn.commit()
+        _cache_put(self._user_autojoin_cache, discord_id, bool(auto_join))
+        self._schedule_commit()
 
     async def delete_user_voice(self, discord_id: int, updated_at: int) -> None:
         if self._conn is None:
             raise RuntimeError("Database not connected")
         await self._conn.execute(
-            "UPDATE discord_users SET voice_id = NULL, updated_at = ? WHERE discord_id = ?",
+            _SQL_DELETE_USER_VOICE,
             (updated_at, discord_id),
         )
-        await self._conn.commit()
+        _cache_put(self._user_voice_cache, discord_id, None)
+        self._schedule_commit()
 
     async def replace_user_voice(self, from_voice_id: str, to_voice_id: str, updated_at: int) -> None:
+        await self.replace_user_voices([(from_voice_id, to_voice_id)], updated_at)
+
+    async def replace_user_voices(self, pairs: list[tuple[str, str]], updated_at: int) -> None:
+        """Apply several (from_voice_id, to_voice_id) renames in one statement batch and one commit."""
         if self._conn is None:
             raise RuntimeError("Database not connected")
-        await self._conn.execute(
-            "UPDATE discord_users SET voice_id = ?, updated_at = ? WHERE voice_id = ?",
-            (to_voice_id, updated_at, from_voice_id),
+        if not pairs:
+            return
+        await self._conn.executemany(
+            _SQL_REPLACE_USER_VOICE,
+            [(to_voice_id, updated_at, from_voice_id) for from_voice_id, to_voice_id in pairs],
         )
-        await self._conn.commit()
+        # Touches every row with the old voices, so drop the whole voice cache.
+        self._user_voice_cache.clear()
+        self._schedule_commit()
 
     async def delete_user_nickname(self, discord_id: int, updated_at: int) -> None:
         if self._conn is None:
             raise RuntimeError("Database not connected")
         await self._conn.execute(
-            "UPDATE discord_users SET nickname = NULL, updated_at = ? WHERE discord_id = ?",
+            _SQL_DELETE_USER_NICKNAME,
             (updated_at, discord_id),
         )
-        await self._conn.commit()
+        _cache_put(self._user_nick_cache, discord_id, None)
+        self._schedule_commit()
 
     async def get_guild_settings(self, guild_id: int) -> Optional[dict[str, Any]]:
         if self._conn is None:
             raise RuntimeError("Database not connected")
-        async with self._conn.execute(
-            """
-            SELECT
-                max_tts_chars, fallback_voice, default_voice_id,
-                auto_read_messages, leave_when_alone,
-                greet_on_join, farewell_on_leave,
-                restrict_voices, allowed_voice_ids,
-                allowlist_text_channel_ids
-            FROM guild_settings
-            WHERE guild_id = ?
-            """,
-            (guild_id,),
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return None
-
-            allowed_raw = row[8] or "[]"
-            allowed: Any
-            if isinstance(allowed_raw, (bytes, bytearray)):
-                allowed_raw = allowed_raw.decode("utf-8", errors="replace")
-            try:
-                allowed = json.loads(str(allowed_raw))
-            except Exception:
-                allowed = []
+        row = await self._fetchone(_SQL_GET_GUILD_SETTINGS, (guild_id,))
+        if not row:
+            return None
+        return _guild_settings_from_row(row)
 
-            allowlist_raw = row[9] or "[]"
-            allowlist: Any
-            if isinstance(allowlist_raw, (bytes, bytearray)):
-                allowlist_raw = allowlist_raw.decode("utf-8", errors="replace")
-            try:
-                allowlist = json.loads(str(allowlist_raw))
-            except Exception:
-                allowlist = []
-
-            raw = {
-                "max_tts_chars": row[0],
-                "fallback_voice": row[1],
-                "default_voice_id": row[2],
-                "auto_read_messages": bool(row[3]),
-                "leave_when_alone": bool(row[4]),
-                "greet_on_join": bool(row[5]),
-                "farewell_on_leave": bool(row[6]),
-                "restrict_voices": bool(row[7]),
-                "allowed_voice_ids": allowed,
-                "allowlist_text_channel_ids": allowlist,
-            }
-            return validate_settings(raw)
+    async def get_many_guild_settings(self, guild_ids: list[int]) -> dict[int, dict[str, Any]]:
+        """Settings for every guild in `guild_ids` that has a row, in one query per batch."""
+        if self._conn is None:
+            raise RuntimeError("Database not connected")
+        found: dict[int, dict[str, Any]] = {}
+        for start in range(0, len(guild_ids), GUILD_SETTINGS_BATCH):
+            batch = guild_ids[start : start + GUILD_SETTINGS_BATCH]
+            sql = (
+                f"SELECT guild_id, {_GUILD_SETTINGS_COLUMNS} FROM guild_settings "
+                f"WHERE guild_id IN ({','.join('?' * len(batch))})"
+            )
+            for row in await self._conn.execute_fetchall(sql, batch):
+                found[row[0]] = _guild_settings_from_row(row[1:])
+        return found
 
     async def ensure_guild_settings(self, guild_id: int, settings: dict[str, Any], updated_at: int) -> None:
         if self._conn is None:
             raise RuntimeError("Database not connected")
-        cleaned = validate_settings({**DEFAULT_SETTINGS, **settings})
+        cleaned = validate_settings_cached({**DEFAULT_SETTINGS, **settings})
         await self._conn.execute(
-            """
-            INSERT INTO guild_settings(
-                guild_id, max_tts_chars, fallback_voice, default_voice_id,
-                auto_read_messages, leave_when_alone,
-                greet_on_join, farewell_on_leave,
-                restrict_voices, allowed_voice_ids,
-                allowlist_text_channel_ids,
-                updated_at
-            )
-            VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(guild_id) DO NOTHING;
-            """,
+            _SQL_ENSURE_GUILD_SETTINGS,
             (
                 guild_id,
                 int(cleaned["max_tts_chars"]),
@@ -376,41 +586,19 @@ class Database:
                 1 if cleaned["greet_on_join"] else 0,
                 1 if cleaned["farewell_on_leave"] else 0,
                 1 if cleaned["restrict_voices"] else 0,
-                json.dumps(cleaned.get("allowed_voice_ids") or []),
-                json.dumps(cleaned.get("allowlist_text_channel_ids") or []),
+                _dumps_ids(cleaned.get("allowed_voice_ids")),
+                _dumps_ids(cleaned.get("allowlist_text_channel_ids")),
                 updated_at,
             ),
         )
-        await self._conn.commit()
+        self._schedule_commit()
 
     async def upsert_guild_settings(self, guild_id: int, settings: dict[str, Any], updated_at: int) -> None:
         if self._conn is None:
             raise RuntimeError("Database not connected")
-        cleaned = validate_settings({**DEFAULT_SETTINGS, **settings})
+        cleaned = validate_settings_cached({**DEFAULT_SETTINGS, **settings})
         await self._conn.execute(
-            """
-            INSERT INTO guild_settings(
-                guild_id, max_tts_chars, fallback_voice, default_voice_id,
-                auto_read_messages, leave_when_alone,
-                greet_on_join, farewell_on_leave,
-                restrict_voices, allowed_voice_ids,
-                allowlist_text_channel_ids,
-                updated_at
-            )
-            VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(guild_id) DO UPDATE SET
-                max_tts_chars=excluded.max_tts_chars,
-                fallback_voice=excluded.fallback_voice,
-                default_voice_id=excluded.default_voice_id,
-                auto_read_messages=excluded.auto_read_messages,
-                leave_when_alone=excluded.leave_when_alone,
-                greet_on_join=excluded.greet_on_join,
-                farewell_on_leave=excluded.farewell_on_leave,
-                restrict_voices=excluded.restrict_voices,
-                allowed_voice_ids=excluded.allowed_voice_ids,
-                allowlist_text_channel_ids=excluded.allowlist_text_channel_ids,
-                updated_at=excluded.updated_at;
-            """,
+            _SQL_UPSERT_GUILD_SETTINGS,
             (
                 guild_id,
                 int(cleaned["max_tts_chars"]),
@@ -421,9 +609,9 @@ class Database:
                 1 if cleaned["greet_on_join"] else 0,
                 1 if cleaned["farewell_on_leave"] else 0,
                 1 if cleaned["restrict_voices"] else 0,
-                json.dumps(cleaned.get("allowed_voice_ids") or []),
-                json.dumps(cleaned.get("allowlist_text_channel_ids") or []),
+                _dumps_ids(cleaned.get("allowed_voice_ids")),
+                _dumps_ids(cleaned.get("allowlist_text_channel_ids")),
                 updated_at,
             ),
         )
-        await self._conn.commit()
+        self._schedule_commit()
@@ -1,46 +1,78 @@
 import asyncio
 import time
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Mapping, Optional
 
 from .db import Database
-from .settings_schema import DEFAULT_SETTINGS, SettingsValidationError, validate_settings
+from .settings_schema import DEFAULT_SETTINGS, SettingsValidationError, validate_settings, validate_settings_cached
 
 
 class GuildSettingsStore:
-    """Cache + DB-backed settings per Discord guild."""
+    """Cache + DB-backed settings per Discord guild.
+
+    Settings are handed out as read-only views of the cached dict; `update`
+    replaces the cached dict rather than mutating it, so views never change
+    underneath a caller. Use `dict(...)` to get an editable or JSON-ready copy.
+    """
 
     def __init__(self, db: Database, *, defaults: Optional[Dict[str, Any]] = None) -> None:
         self._db = db
         self._defaults = validate_settings(defaults or DEFAULT_SETTINGS)
-        self._cache: dict[int, Dict[str, Any]] = {}
-        self._lock = asyncio.Lock()
+        self._cache: dict[int, Mapping[str, Any]] = {}
+        self._versions: dict[int, int] = {}
+        # One lock per guild, so a slow DB write for one guild never blocks another.
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    def _lock_for(self, guild_id: int) -> asyncio.Lock:
+        # No await between lookup and insert, so this is race-free on the event loop.
+        lock = self._locks.get(guild_id)
+        if lock is None:
+            lock = self._locks[guild_id] = asyncio.Lock()
+        return lock
 
-    async def _get_locked(self, guild_id: int) -> Dict[str, Any]:
+    async def _get_locked(self, guild_id: int) -> Mapping[str, Any]:
         cached = self._cache.get(guild_id)
         if cached is not None:
-            return dict(cached)
+            return cached
 
         settings = await self._db.get_guild_settings(guild_id)
         if settings is None:
             settings = dict(self._defaults)
             await self._db.ensure_guild_settings(guild_id, settings, int(time.time()))
-        else:
-            settings = validate_settings(settings)
 
-        self._cache[guild_id] = dict(settings)
-        return dict(settings)
+        # Guilds with identical settings share one validated view.
+        view = self._cache[guild_id] = validate_settings_cached(settings)
+        return view
 
     async def preload(self, guild_ids: Iterable[int]) -> None:
-        async with self._lock:
-            for gid in guild_ids:
-                await self._get_locked(int(gid))
+        missing = [gid for gid in dict.fromkeys(int(g) for g in guild_ids) if gid not in self._cache]
+        if not missing:
+            return
+        # One SELECT per batch for every guild that already has a row.
+        for gid, settings in (await self._db.get_many_guild_settings(missing)).items():
+            # setdefault: an update that landed while we were reading wins.
+            self._cache.setdefault(gid, validate_settings_cached(settings))
+        # Guilds without a row yet get defaults written through the normal path.
+        for gid in missing:
+            if gid not in self._cache:
+                await self.get(gid)
+
+    def version(self, guild_id: int) -> int:
+        """Monotonic counter bumped whenever a guild's settings change."""
+        return self._versions.get(guild_id, 0)
 
-    async def get(self, guild_id: int) -> Dict[str, Any]:
-        async with self._lock:
+    def _bump(self, guild_id: int) -> None:
+        self._versions[guild_id] = self._versions.get(guild_id, 0) + 1
+
+    async def get(self, guild_id: int) -> Mapping[str, Any]:
+        # Cache hits need no lock; only a miss (DB load) is serialised per guild.
+        cached = self._cache.get(guild_id)
+        if cached is not None:
+            return cached
+        async with self._lock_for(guild_id):
             return await self._get_locked(guild_id)
 
-    async def update(self, guild_id: int, patch: Dict[str, Any]) -> Dict[str, Any]:
-        async with self._lock:
+    async def update(self, guild_id: int, patch: Dict[str, Any]) -> Mapping[str, Any]:
+        async with self._lock_for(guild_id):
             current = await self._get_locked(guild_id)
             merged = dict(current)
             for k, v in patch.items():
@@ -48,12 +80,14 @@ class GuildSettingsStore:
                     raise SettingsValidationError(f"Unknown setting: {k}")
                 merged[k] = v
 
-            cleaned = validate_settings(merged)
+            cleaned = validate_settings_cached(merged)
             await self._db.upsert_guild_settings(guild_id, cleaned, int(time.time()))
-            self._cache[guild_id] = dict(cleaned)
-            return dict(cleaned)
+            self._cache[guild_id] = cleaned
+            self._bump(guild_id)
+            return cleaned
 
     async def invalidate(self, guild_id: int) -> None:
-        async with self._lock:
+        async with self._lock_for(guild_id):
             self._cache.pop(guild_id, None)
+            self._bump(guild_id)
 
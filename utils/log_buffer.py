@@ -1,64 +1,134 @@
 import asyncio
+import copy
 import logging
 import os
 import threading
 from collections import deque
 from dataclasses import dataclass
-from typing import Deque, List, Optional, Set, Tuple
+from itertools import islice
+from typing import Callable, Deque, List, Optional, Tuple, Union
+
+# A stored line, or a record plus the callable that renders it on first read.
+_Item = Union[str, Tuple[logging.LogRecord, Callable[[logging.LogRecord], str]]]
 
 
 @dataclass
 class LogSubscription:
-    queue: asyncio.Queue
+    seq: int
     initial_lines: List[str]
 
 
 class LogBuffer:
+    """Recent log lines plus a sequence number live viewers wait on.
+
+    Appending does the same work however many viewers are connected; each viewer
+    reads the lines past its last-seen sequence after `wait()` returns.
+
+    Lines are stored as `[seq, item]` so a single `list(deque)` snapshot, which
+    the GIL makes atomic, is self-consistent and readers need no lock. Appends
+    must be serialised by the caller; `LogHandler` does this with the handler
+    lock `logging` already holds around `emit`.
+
+    `append_record` stores the record (with its message already merged) and formats
+    it the first time a reader asks for it, on the loop thread, replacing the item with the rendered line.
+    Records that fall out of the ring before anyone reads them are never formatted.
+    """
+
     def __init__(self, loop: asyncio.AbstractEventLoop, max_lines: int = 1000) -> None:
         self._loop = loop
-        self._lines: Deque[str] = deque(maxlen=max_lines)
-        self._lock = threading.Lock()
-        self._subscribers: Set[asyncio.Queue] = set()
+        self._entries: Deque[list] = deque(maxlen=max_lines)
+        self._seq = 0
+        # Viewers wait on the current event; a notify sets it and swaps in a fresh one.
+        self._wakeup = asyncio.Event()
+        self._notify_pending = False
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        # Appends on the loop's own thread skip the self-pipe write of call_soon_threadsafe.
+        self._loop_thread = threading.get_ident() if running is loop else None
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @staticmethod
+    def _lines(entries: List[list]) -> List[str]:
+        lines = []
+        for entry in entries:
+            item = entry[1]
+            if item.__class__ is not str:
+                record, render = item
+                item = entry[1] = render(record)
+            lines.append(item)
+        return lines
+
+    def _tail_entries(self, tail: int) -> List[list]:
+        # Walk back from the newest entry so only `tail` items are copied; still one C-level pass.
+        entries = list(islice(reversed(self._entries), tail))
+        entries.reverse()
+        return entries
 
     def get_lines(self, tail: Optional[int] = None) -> List[str]:
-        with self._lock:
-            lines = list(self._lines)
         if tail is None:
-            return lines
-        if tail <= 0:
+            entries = list(self._entries)
+        elif tail <= 0:
             return []
-        return lines[-tail:]
-
-    def subscribe(self, max_queue: int = 200, tail: int = 500) -> LogSubscription:
-        q: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
-        with self._lock:
-            self._subscribers.add(q)
-            if tail <= 0:
-                initial = []
-            else:
-                initial = list(self._lines)[-tail:]
-        return LogSubscription(queue=q, initial_lines=initial)
-
-    def unsubscribe(self, q: asyncio.Queue) -> None:
-        with self._lock:
-            self._subscribers.discard(q)
+        else:
+            entries = self._tail_entries(tail)
+        return self._lines(entries)
+
+    def subscribe(self, tail: int = 500) -> LogSubscription:
+        entries = self._tail_entries(max(tail, 1))
+        seq = entries[-1][0] if entries else self._seq
+        initial = self._lines(entries) if tail > 0 else []
+        return LogSubscription(seq=seq, initial_lines=initial)
+
+    def lines_since(self, seq: int) -> Tuple[List[str], int]:
+        """Return the retained lines newer than `seq` and the sequence to resume from."""
+        entries = list(self._entries)
+        current = entries[-1][0] if entries else self._seq
+        if current <= seq:
+            return [], current
+        # Sequences are consecutive; viewers that fell further behind than the ring holds skip the lost lines.
+        start = max(seq + 1 - entries[0][0], 0)
+        return self._lines(entries[start:]), current
+
+    async def wait(self, seq: int) -> None:
+        """Block until a line newer than `seq` has been appended."""
+        while self._seq <= seq:
+            await self._wakeup.wait()
+
+    def _notify(self) -> None:
+        # Runs on the loop once per burst of appends; clear the flag first so no line is missed.
+        self._notify_pending = False
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
 
     def append(self, line: str) -> None:
-        # Can be called from any thread.
-        with self._lock:
-            self._lines.append(line)
-            subscribers = list(self._subscribers)
-
-        def fanout() -> None:
-            for q in subscribers:
-                try:
-                    q.put_nowait(line)
-                except asyncio.QueueFull:
-                    # Drop lines for slow consumers.
-                    pass
-
-        if self._loop.is_running():
-            self._loop.call_soon_threadsafe(fanout)
+        self._append(line)
+
+    def append_record(self, record: logging.LogRecord, render: Callable[[logging.LogRecord], str]) -> None:
+        """Store `record` unformatted; `render(record)` runs when a reader first needs the line."""
+        self._append((record, render))
+
+    def _append(self, item: _Item) -> None:
+        # Can be called from any thread, one at a time.
+        seq = self._seq + 1
+        self._entries.append([seq, item])
+        self._seq = seq
+        # One wakeup covers every line appended before viewers get to run.
+        # `_notify` clears the flag before notifying, so a line that sees it set is never missed.
+        if self._notify_pending:
+            return
+        self._notify_pending = True
+
+        if threading.get_ident() == self._loop_thread:
+            self._loop.call_soon(self._notify)
+        elif self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._notify)
+        else:
+            self._notify_pending = False
 
 
 class LogHandler(logging.Handler):
@@ -68,11 +138,27 @@ class LogHandler(logging.Handler):
 
     def emit(self, record: logging.LogRecord) -> None:
         try:
-            msg = self.format(record)
+            if record.exc_info:
+                # Tracebacks pin their frames; render those now rather than keep them alive in the ring.
+                self._buffer.append(self._render(record))
+                return
+            # Merge the args now, as QueueHandler.prepare does: a mutable arg must read as it
+            # was when logged, and the ring shouldn't keep arg objects alive. Only the header
+            # (asctime/levelname/name) is left for the first read. The copy leaves the record
+            # other handlers see untouched.
+            frozen = copy.copy(record)
+            frozen.msg = record.getMessage()
+            frozen.args = None
+            self._buffer.append_record(frozen, self._render)
+        except Exception:
+            self.handleError(record)
+
+    def _render(self, record: logging.LogRecord) -> str:
+        try:
+            return self.format(record)
         except Exception:
             # Best-effort, never break logging.
-            msg = record.getMessage()
-        self._buffer.append(msg)
+            return record.getMessage()
 
 
 # Backwards-compatible alias
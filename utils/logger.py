@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import mmap
 import os
 from pathlib import Path
 from typing import Optional
@@ -169,28 +170,18 @@ def get_last_log_lines(count: int = 500) -> str:
 
 
 def _tail_file(path: Path, count: int) -> list[str]:
-    # Efficient-ish tail implementation: read from the end in blocks.
-    # Falls back to full read for small files.
+    # Map the file and walk newlines back from the end, so only the tail pages are touched.
     with path.open("rb") as f:
-        f.seek(0, os.SEEK_END)
-        end = f.tell()
-        if end == 0:
+        if os.fstat(f.fileno()).st_size == 0:
             return []
-
-        block_size = 8192
-        blocks: list[bytes] = []
-        remaining = end
-        newline_count = 0
-
-        while remaining > 0 and newline_count <= count:
-            read_size = block_size if remaining >= block_size else remaining
-            remaining -= read_size
-            f.seek(remaining)
-            data = f.read(read_size)
-            blocks.append(data)
-            newline_count += data.count(b"\n")
-
-        content = b"".join(reversed(blocks))
-        # Splitlines keeps trailing empty line consistent.
-        lines = content.splitlines(keepends=True)
-        return [line.decode("utf-8", errors="replace") for line in lines[-count:]]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # A trailing newline ends the last line rather than starting an empty one.
+            pos = len(mm) - 1 if mm[-1:] == b"\n" else len(mm)
+            for _ in range(count):
+                pos = mm.rfind(b"\n", 0, pos)
+                if pos < 0:
+                    break
+            data = mm[pos + 1 :]
+
+    lines = data.splitlines(keepends=True)
+    return [line.decode("utf-8", errors="replace") for line in lines[-count:]]
@@ -6,6 +6,9 @@ DJ intro generator using OpenAI (openai==2.x)
 - Uses Structured Outputs via `text={"format": {...}}` (NOT response_format)
 - Validates title+artist presence
 - Retries once, then falls back
+- all calls share one AsyncOpenAI client (utils/openai_client.py)
+- single intros are streamed and cut off once the JSON object closes
+- dj_intro_gather_async fans out per-song requests under a semaphore
 
 Env var required:
   OPENAI_API_KEY=...
@@ -16,13 +19,27 @@ Optional:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from typing import Optional, Tuple, Union
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
+from .openai_client import get_async_openai_client
+
+try:  # Optional: orjson encodes prompt payloads and parses model output faster.
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Upper bound on concurrent per-song requests in `dj_intro_gather_async`.
+GATHER_CONCURRENCY = 8
 
 SYSTEM = (
     "You are Vexo FM, a charismatic radio host introducing songs.\n"
@@ -45,6 +62,21 @@ JSON_SCHEMA = {
     "strict": True,
 }
 
+BATCH_SYSTEM = SYSTEM + (
+    "- You will receive a list of songs; write one intro per song, in the same order.\n"
+)
+
+BATCH_JSON_SCHEMA = {
+    "name": "dj_intros",
+    "schema": {
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {"intros": {"type": "array", "items": {"type": "string"}}},
+        "required": ["intros"],
+    },
+    "strict": True,
+}
+
 SUGGESTIONS_SYSTEM = (
     "You are a music recommendation engine.\n"
     "Return 5 similar songs to the seed track provided.\n"
@@ -81,6 +113,14 @@ SUGGESTIONS_SCHEMA = {
     "strict": True,
 }
 
+
+def _payload_json(payload: object) -> str:
+    # Unescaped UTF-8 either way, matching json.dumps(ensure_ascii=False).
+    if orjson is not None:
+        return orjson.dumps(payload).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False)
+
+
 def _strip_code_fences(text: str) -> str:
     value = (text or "").strip()
     if value.startswith("```"):
@@ -96,8 +136,99 @@ def _strip_code_fences(text: str) -> str:
 def _has_title_artist(text: str, title: str, artist: str) -> bool:
     t = (title or "").strip().lower()
     a = (artist or "").strip().lower()
-    x = (text or "").strip().lower()
-    return bool(t) and bool(a) and (t in x) and (a in x)
+    if not t or not a:
+        return False
+    # Surrounding whitespace can't change a substring match, so `text` is only lowered.
+    x = (text or "").lower()
+    return t in x and a in x
+
+
+def _build_text_format(schema: dict) -> dict:
+    return {
+        "format": {
+            "type": "json_schema",
+            "name": schema["name"],
+            "schema": schema["schema"],
+            "strict": schema["strict"],
+        }
+    }
+
+
+# The schemas are fixed, so their `text=` arguments are built once and reused on every call.
+_TEXT_FORMATS = {
+    schema["name"]: _build_text_format(schema)
+    for schema in (JSON_SCHEMA, BATCH_JSON_SCHEMA, SUGGESTIONS_SCHEMA)
+}
+
+
+def _text_format(schema: dict) -> dict:
+    text_format = _TEXT_FORMATS.get(schema["name"])
+    return text_format if text_format is not None else _build_text_format(schema)
+
+
+def _responses_args(system: str, user_content: str, schema: dict, temperature: float, max_tokens: int) -> dict:
+    return {
+        "model": MODEL,
+        "input": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user_content},
+        ],
+        # Structured output for Responses API
+        "text": _text_format(schema),
+        "temperature": temperature,
+        "max_output_tokens": max_tokens,
+    }
+
+
+def _chat_args(system: str, user_content: str, temperature: float, max_tokens: int) -> dict:
+    return {
+        "model": MODEL,
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user_content},
+        ],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+
+
+async def _acomplete(
+    client: AsyncOpenAI, system: str, user_content: str, schema: dict, *, temperature: float, max_tokens: int
+) -> str:
+    if hasattr(client, "responses"):
+        resp = await client.responses.create(**_responses_args(system, user_content, schema, temperature, max_tokens))
+        return _strip_code_fences(resp.output_text or "")
+    # Older OpenAI SDK: fall back to chat completions.
+    resp = await client.chat.completions.create(**_chat_args(system, user_content, temperature, max_tokens))
+    return _strip_code_fences(resp.choices[0].message.content or "")
+
+
+def _json_complete(parts: list[str]) -> bool:
+    """True once the streamed text so far is a whole JSON document."""
+    if not parts[-1].rstrip().endswith("}"):
+        return False
+    try:
+        _loads(_strip_code_fences("".join(parts)))
+    except ValueError:
+        return False
+    return True
+
+
+async def _acomplete_streamed(
+    client: AsyncOpenAI, system: str, user_content: str, schema: dict, *, temperature: float, max_tokens: int
+) -> str:
+    """`_acomplete`, but streamed and cut off as soon as the JSON object closes."""
+    responses = getattr(client, "responses", None)
+    if responses is None or not hasattr(responses, "stream"):
+        return await _acomplete(client, system, user_content, schema, temperature=temperature, max_tokens=max_tokens)
+    parts: list[str] = []
+    async with responses.stream(**_responses_args(system, user_content, schema, temperature, max_tokens)) as stream:
+        async for event in stream:
+            if event.type == "response.output_text.delta" and event.delta:
+                parts.append(event.delta)
+                if _json_complete(parts):
+                    break
+    return _strip_code_fences("".join(parts))
 
 
 def dj_intro_fallback(
@@ -113,7 +244,46 @@ def dj_intro_fallback(
     return f"Up next on Vexo FM: “{title}” by {artist}."
 
 
-def dj_intro(
+def _intro_user_content(
+    title: str, artist: str, requested_by: Optional[str], for_user: Optional[str]
+) -> str:
+    payload = {
+        "title": title,
+        "artist": artist,
+        "requested_by": requested_by,
+        "for_user": for_user,
+    }
+    return (
+        "Generate the DJ intro JSON for this payload.\n"
+        f"Payload:\n{_payload_json(payload)}"
+    )
+
+
+def _intro_result(
+    raw: str, title: str, artist: str, requested_by: Optional[str], for_user: Optional[str]
+) -> Optional[Tuple[str, str, bool]]:
+    """Parse one attempt; None means retry."""
+    if not raw:
+        return None
+
+    try:
+        data = _loads(raw)
+        intro = str(data.get("intro", "")).strip()
+    except Exception:
+        return None
+
+    if not intro:
+        return None
+
+    # Guarantee it says title + artist (or fallback)
+    if not _has_title_artist(intro, title, artist):
+        intro = dj_intro_fallback(title=title, artist=artist, requested_by=requested_by, for_user=for_user)
+        return (intro, raw, True)
+
+    return (intro, raw, False)
+
+
+async def dj_intro_async(
     *,
     title: str,
     artist: str,
@@ -121,167 +291,175 @@ def dj_intro(
     for_user: Optional[str] = None,
     return_debug: bool = False,
 ) -> Union[str, Tuple[str, str, bool]]:
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    if not OPENAI_API_KEY:
         fb = dj_intro_fallback(title=title, artist=artist, requested_by=requested_by, for_user=for_user)
         return (fb, "", True) if return_debug else fb
 
-    client = OpenAI(api_key=api_key)
-
-    payload = {
-        "title": title,
-        "artist": artist,
-        "requested_by": requested_by,
-        "for_user": for_user,
-    }
+    client = get_async_openai_client(OPENAI_API_KEY)
+    user_content = _intro_user_content(title, artist, requested_by, for_user)
 
     last_raw = ""
-    user_content = (
-        "Generate the DJ intro JSON for this payload.\n"
-        f"Payload:\n{json.dumps(payload, ensure_ascii=False)}"
-    )
-
     for _ in range(2):  # 1 retry
-        if hasattr(client, "responses"):
-            resp = client.responses.create(
-                model=MODEL,
-                input=[
-                    {"role": "system", "content": SYSTEM},
-                    {"role": "user", "content": user_content},
-                ],
-                # Structured output for Responses API
-                text={
-                    "format": {
-                        "type": "json_schema",
-                        "name": JSON_SCHEMA["name"],
-                        "schema": JSON_SCHEMA["schema"],
-                        "strict": JSON_SCHEMA["strict"],
-                    }
-                },
-                temperature=0.7,
-                max_output_tokens=180,
-            )
-            raw = _strip_code_fences(resp.output_text or "")
-        else:
-            # Older OpenAI SDK: fall back to chat completions.
-            resp = client.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {"role": "system", "content": SYSTEM},
-                    {"role": "user", "content": user_content},
-                ],
-                temperature=0.7,
-                max_tokens=180,
-            )
-            raw = _strip_code_fences(resp.choices[0].message.content or "")
-
-        last_raw = raw
-        if not raw:
-            continue
-
-        try:
-            data = json.loads(raw)
-            intro = str(data.get("intro", "")).strip()
-        except Exception:
-            continue
-
-        if not intro:
-            continue
-
-        # Guarantee it says title + artist (or fallback)
-        if not _has_title_artist(intro, title, artist):
-            intro = dj_intro_fallback(title=title, artist=artist, requested_by=requested_by, for_user=for_user)
-            return (intro, raw, True) if return_debug else intro
-
-        return (intro, raw, False) if return_debug else intro
+        raw = last_raw = await _acomplete_streamed(
+            client, SYSTEM, user_content, JSON_SCHEMA, temperature=0.7, max_tokens=180
+        )
+        result = _intro_result(raw, title, artist, requested_by, for_user)
+        if result is not None:
+            return result if return_debug else result[0]
 
     fb = dj_intro_fallback(title=title, artist=artist, requested_by=requested_by, for_user=for_user)
     return (fb, last_raw, True) if return_debug else fb
 
 
-def song_suggestions(
+def _intros_user_content(items: list[dict[str, Optional[str]]]) -> str:
+    payload = [
+        {
+            "title": item.get("title"),
+            "artist": item.get("artist"),
+            "requested_by": item.get("requested_by"),
+            "for_user": item.get("for_user"),
+        }
+        for item in items
+    ]
+    return (
+        f"Generate intros for the following {len(items)} songs, in the same order.\n"
+        f"Payload:\n{_payload_json(payload)}"
+    )
+
+
+def _intros_result(raw: str, items: list[dict[str, Optional[str]]]) -> Optional[list[Tuple[str, str, bool]]]:
+    """Parse one batched attempt; None means retry."""
+    if not raw:
+        return None
+
+    try:
+        intros = _loads(raw).get("intros")
+    except Exception:
+        return None
+
+    if not isinstance(intros, list) or len(intros) != len(items):
+        return None
+
+    results: list[Tuple[str, str, bool]] = []
+    for item, intro in zip(items, intros):
+        intro = str(intro or "").strip()
+        # Same guarantee as dj_intro_async: title + artist present, else fallback.
+        if not intro or not _has_title_artist(intro, item.get("title") or "", item.get("artist") or ""):
+            results.append((dj_intro_fallback(**item), raw, True))
+        else:
+            results.append((intro, raw, False))
+    return results
+
+
+async def dj_intro_many_async(items: list[dict[str, Optional[str]]]) -> list[Tuple[str, str, bool]]:
+    """Generate intros for several songs in one request.
+
+    Each item holds the `dj_intro_async` keyword arguments (title, artist,
+    requested_by, for_user). Returns one `(intro, raw, used_fallback)` tuple
+    per item, in order; items whose intro fails validation get the fallback.
+    """
+    if len(items) == 1:
+        return [await dj_intro_async(**items[0], return_debug=True)]
+
+    if not OPENAI_API_KEY or not items:
+        return [(dj_intro_fallback(**item), "", True) for item in items]
+
+    client = get_async_openai_client(OPENAI_API_KEY)
+    user_content = _intros_user_content(items)
+
+    for _ in range(2):  # 1 retry
+        raw = await _acomplete(
+            client, BATCH_SYSTEM, user_content, BATCH_JSON_SCHEMA, temperature=0.7, max_tokens=180 * len(items)
+        )
+        results = _intros_result(raw, items)
+        if results is not None:
+            return results
+
+    # The model kept botching the list; ask per song, concurrently, instead of falling back wholesale.
+    return await dj_intro_gather_async(items)
+
+
+async def dj_intro_gather_async(
+    items: list[dict[str, Optional[str]]], concurrency: int = GATHER_CONCURRENCY
+) -> list[Tuple[str, str, bool]]:
+    """Run one `dj_intro_async` per item concurrently, at most `concurrency` at a time.
+
+    Returns `(intro, raw, used_fallback)` per item, in order; an item whose
+    request raises gets the fallback.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(item: dict[str, Optional[str]]) -> Tuple[str, str, bool]:
+        async with sem:
+            return await dj_intro_async(**item, return_debug=True)
+
+    results = await asyncio.gather(*(one(item) for item in items), return_exceptions=True)
+    return [
+        (dj_intro_fallback(**item), "", True) if isinstance(result, BaseException) else result
+        for item, result in zip(items, results)
+    ]
+
+
+def _suggestions_user_content(title: str, artist: str) -> str:
+    payload = {"title": title, "artist": artist}
+    return (
+        "Generate similar song suggestions for this seed track.\n"
+        f"Payload:\n{_payload_json(payload)}"
+    )
+
+
+def _suggestions_result(raw: str, title: str, artist: str) -> Optional[list[dict[str, str]]]:
+    """Parse one attempt; None means retry."""
+    if not raw:
+        return None
+
+    try:
+        data = _loads(raw)
+    except Exception:
+        return None
+
+    suggestions = data.get("suggestions")
+    if not isinstance(suggestions, list) or len(suggestions) != 5:
+        return None
+
+    cleaned: list[dict[str, str]] = []
+    seen = set()
+    seed_key = f"{(title or '').strip().lower()}::{(artist or '').strip().lower()}"
+    for item in suggestions:
+        if not isinstance(item, dict):
+            return None
+        t = str(item.get("title", "")).strip()
+        a = str(item.get("artist", "")).strip()
+        if not t or not a:
+            return None
+        key = f"{t.lower()}::{a.lower()}"
+        if key == seed_key or key in seen:
+            return None
+        seen.add(key)
+        cleaned.append({"title": t, "artist": a})
+
+    return cleaned if len(cleaned) == 5 else None
+
+
+async def song_suggestions_async(
     *,
     title: str,
     artist: str,
     return_debug: bool = False,
 ) -> Union[list[dict[str, str]], Tuple[list[dict[str, str]], str, bool]]:
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    if not OPENAI_API_KEY:
         return ([], "", True) if return_debug else []
 
-    client = OpenAI(api_key=api_key)
-    payload = {"title": title, "artist": artist}
-    user_content = (
-        "Generate similar song suggestions for this seed track.\n"
-        f"Payload:\n{json.dumps(payload, ensure_ascii=False)}"
-    )
+    client = get_async_openai_client(OPENAI_API_KEY)
+    user_content = _suggestions_user_content(title, artist)
 
     last_raw = ""
     for _ in range(2):  # 1 retry
-        if hasattr(client, "responses"):
-            resp = client.responses.create(
-                model=MODEL,
-                input=[
-                    {"role": "system", "content": SUGGESTIONS_SYSTEM},
-                    {"role": "user", "content": user_content},
-                ],
-                text={
-                    "format": {
-                        "type": "json_schema",
-                        "name": SUGGESTIONS_SCHEMA["name"],
-                        "schema": SUGGESTIONS_SCHEMA["schema"],
-                        "strict": SUGGESTIONS_SCHEMA["strict"],
-                    }
-                },
-                temperature=0.6,
-                max_output_tokens=220,
-            )
-            raw = _strip_code_fences(resp.output_text or "")
-        else:
-            resp = client.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {"role": "system", "content": SUGGESTIONS_SYSTEM},
-                    {"role": "user", "content": user_content},
-                ],
-                temperature=0.6,
-                max_tokens=220,
-            )
-            raw = _strip_code_fences(resp.choices[0].message.content or "")
-
-        last_raw = raw
-        if not raw:
-            continue
-
-        try:
-            data = json.loads(raw)
-        except Exception:
-            continue
-
-        suggestions = data.get("suggestions")
-        if not isinstance(suggestions, list) or len(suggestions) != 5:
-            continue
-
-        cleaned: list[dict[str, str]] = []
-        seen = set()
-        seed_key = f"{(title or '').strip().lower()}::{(artist or '').strip().lower()}"
-        for item in suggestions:
-            if not isinstance(item, dict):
-                cleaned = []
-                break
-            t = str(item.get("title", "")).strip()
-            a = str(item.get("artist", "")).strip()
-            if not t or not a:
-                cleaned = []
-                break
-            key = f"{t.lower()}::{a.lower()}"
-            if key == seed_key or key in seen:
-                cleaned = []
-                break
-            seen.add(key)
-            cleaned.append({"title": t, "artist": a})
-
-        if len(cleaned) == 5:
+        raw = last_raw = await _acomplete(
+            client, SUGGESTIONS_SYSTEM, user_content, SUGGESTIONS_SCHEMA, temperature=0.6, max_tokens=220
+        )
+        cleaned = _suggestions_result(raw, title, artist)
+        if cleaned is not None:
             return (cleaned, raw, False) if return_debug else cleaned
 
     return ([], last_raw, True) if return_debug else []
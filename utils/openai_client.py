@@ -0,0 +1,48 @@
+"""
+utils/openai_client.py
+
+One AsyncOpenAI client, on one httpx connection pool, shared by every
+OpenAI call (utils/open_ai.py), so TLS connections opened by one request
+are reused by the next.
+HTTP/2 is used when the optional `h2` package is installed.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+# Optional: installed with `pip install httpx[http2]`.
+HTTP2 = importlib.util.find_spec("h2") is not None
+TIMEOUT = 15.0
+
+_http: Optional[httpx.AsyncClient] = None
+_client: Optional[AsyncOpenAI] = None
+_client_key: Optional[str] = None
+
+
+def get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """Cached AsyncOpenAI client for `api_key`, backed by the shared connection pool."""
+    global _http, _client, _client_key
+    if _http is None or _http.is_closed:
+        # The SDK's own defaults (limits, redirects), just shared.
+        _http = DefaultAsyncHttpxClient(http2=HTTP2)
+        _client = None
+    if _client is None or _client_key != api_key:
+        # A key change swaps the client only; the old one is not closed, as that would close the pool.
+        _client = AsyncOpenAI(api_key=api_key, timeout=TIMEOUT, http_client=_http)
+        _client_key = api_key
+    return _client
+
+
+async def close_async_client() -> None:
+    """Close the shared connection pool; the next call builds a fresh one."""
+    global _http, _client, _client_key
+    if _http is not None and not _http.is_closed:
+        await _http.aclose()
+    _http = None
+    _client = None
+    _client_key = None
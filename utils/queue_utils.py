@@ -3,16 +3,23 @@ from typing import Tuple
 
 
 async def enqueue_with_drop(queue: asyncio.Queue, item, policy: str = "drop_oldest") -> Tuple[int, bool]:
-    dropped = 0
-    if queue.full():
-        if policy == "drop_oldest":
-            try:
-                _ = queue.get_nowait()
-                queue.task_done()
-                dropped = 1
-            except asyncio.QueueEmpty:
-                pass
-        else:
+    # Try the put first: only drop when the queue is actually full at that moment.
+    try:
+        queue.put_nowait(item)
+        return 0, True
+    except asyncio.QueueFull:
+        if policy != "drop_oldest":
             return 0, False
-    await queue.put(item)
+
+    dropped = 0
+    try:
+        _ = queue.get_nowait()
+        queue.task_done()
+        dropped = 1
+    except asyncio.QueueEmpty:
+        pass
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        await queue.put(item)
     return dropped, True
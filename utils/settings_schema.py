@@ -1,7 +1,9 @@
+import functools
 import json
+from types import MappingProxyType
 from typing import Any, Dict, Mapping
 
-from .config import ALL_VOICE_IDS, FALLBACK_VOICE, MAX_TTS_CHARS
+from .config import ALL_VOICE_IDS, FALLBACK_VOICE, MAX_TTS_CHARS, TRUTHY_STRINGS
 
 
 class SettingsValidationError(ValueError):
@@ -24,6 +26,12 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 }
 
 
+def _flag(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in TRUTHY_STRINGS
+    return bool(value)
+
+
 def validate_settings(data: Mapping[str, Any]) -> Dict[str, Any]:
     merged = dict(DEFAULT_SETTINGS)
     merged.update(data)
@@ -52,20 +60,9 @@ def validate_settings(data: Mapping[str, Any]) -> Dict[str, Any]:
     cleaned["auto_read_messages"] = bool(merged.get("auto_read_messages", True))
     cleaned["leave_when_alone"] = bool(merged.get("leave_when_alone", True))
 
-    greet_on_join = merged.get("greet_on_join", False)
-    if isinstance(greet_on_join, str):
-        greet_on_join = greet_on_join.strip().lower() in {"1", "true", "yes", "y", "on"}
-    cleaned["greet_on_join"] = bool(greet_on_join)
-
-    farewell_on_leave = merged.get("farewell_on_leave", False)
-    if isinstance(farewell_on_leave, str):
-        farewell_on_leave = farewell_on_leave.strip().lower() in {"1", "true", "yes", "y", "on"}
-    cleaned["farewell_on_leave"] = bool(farewell_on_leave)
-
-    restrict_voices = merged.get("restrict_voices", False)
-    if isinstance(restrict_voices, str):
-        restrict_voices = restrict_voices.strip().lower() in {"1", "true", "yes", "y", "on"}
-    cleaned["restrict_voices"] = bool(restrict_voices)
+    cleaned["greet_on_join"] = _flag(merged.get("greet_on_join", False))
+    cleaned["farewell_on_leave"] = _flag(merged.get("farewell_on_leave", False))
+    cleaned["restrict_voices"] = _flag(merged.get("restrict_voices", False))
 
     allowed_voice_ids = merged.get("allowed_voice_ids", [])
     if isinstance(allowed_voice_ids, str):
@@ -81,7 +78,8 @@ def validate_settings(data: Mapping[str, Any]) -> Dict[str, Any]:
     seen: set[str] = set()
     cleaned_allowed: list[str] = []
     for item in allowed_voice_ids:
-        voice = str(item or "").strip()
+        # Stored settings are already strings; only coerce other values.
+        voice = item.strip() if item.__class__ is str else str(item or "").strip()
         if not voice or voice in seen:
             continue
         seen.add(voice)
@@ -105,10 +103,13 @@ def validate_settings(data: Mapping[str, Any]) -> Dict[str, Any]:
     cleaned_allowlist: list[int] = []
     seen_ids: set[int] = set()
     for item in allowlist:
-        try:
-            cid = int(item)
-        except (TypeError, ValueError):
-            continue
+        if item.__class__ is int:
+            cid = item
+        else:
+            try:
+                cid = int(item)
+            except (TypeError, ValueError):
+                continue
         if cid <= 0 or cid in seen_ids:
             continue
         seen_ids.add(cid)
@@ -129,3 +130,26 @@ def validate_settings(data: Mapping[str, Any]) -> Dict[str, Any]:
             )
 
     return cleaned
+
+
+def _frozen_view(cleaned: Dict[str, Any]) -> Mapping[str, Any]:
+    # The id lists become tuples so a shared (cached) view can't be mutated through them.
+    return MappingProxyType({k: tuple(v) if isinstance(v, list) else v for k, v in cleaned.items()})
+
+
+@functools.lru_cache(maxsize=4096)
+def _validate_frozen(items: tuple[tuple[str, Any], ...]) -> Mapping[str, Any]:
+    return _frozen_view(validate_settings(dict(items)))
+
+
+def validate_settings_cached(settings: Mapping[str, Any]) -> Mapping[str, Any]:
+    """`validate_settings` as a read-only view, memoised on the input's contents.
+
+    The view is shared between callers, so its id lists are returned as tuples.
+    """
+    # Lists (the id allowlists) become tuples for hashing; validate_settings accepts both.
+    items = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in settings.items()))
+    try:
+        return _validate_frozen(items)
+    except TypeError:  # Some value isn't hashable; validate without the cache.
+        return _frozen_view(validate_settings(settings))
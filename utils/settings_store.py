@@ -3,27 +3,45 @@ import json
 import os
 from typing import Any, Dict, Optional
 
+from .logger import get_logger
 from .settings_schema import DEFAULT_SETTINGS, SettingsValidationError, validate_settings
 
+try:  # Optional: orjson encodes the (long) allowed voice list much faster.
+    import orjson
+except ImportError:
+    orjson = None
+
 VERSION = "1.1.2"
 
+logger = get_logger("settings")
+
+# Updates within this window are written to disk once.
+WRITE_DELAY = 0.2
+
+
 class SettingsStore:
     def __init__(self, path: str, defaults: Optional[Dict[str, Any]] = None) -> None:
         self.path = path
         self._lock = asyncio.Lock()
         self._data: Dict[str, Any] = dict(defaults or DEFAULT_SETTINGS)
+        self._dirty = False
+        self._write_task: Optional[asyncio.Task] = None
+        # Serialises file writes: they share one temp path.
+        self._write_lock = asyncio.Lock()
 
     async def load(self) -> Dict[str, Any]:
         async with self._lock:
             data = await asyncio.to_thread(self._read_file)
             if data is None:
-                await asyncio.to_thread(self._write_file, self._data)
+                await self._write_now(self._data)
             else:
                 # Merge and validate
                 merged = dict(DEFAULT_SETTINGS)
                 merged.update(data)
                 self._data = validate_settings(merged)
-                await asyncio.to_thread(self._write_file, self._data)
+                # Only rewrite the file when validation filled in or normalised something.
+                if self._data != data:
+                    await self._write_now(self._data)
             return dict(self._data)
 
     async def get(self) -> Dict[str, Any]:
@@ -39,22 +57,69 @@ class SettingsStore:
                 merged[k] = v
             merged = validate_settings(merged)
             self._data = merged
-            await asyncio.to_thread(self._write_file, self._data)
+            self._schedule_write()
             return dict(self._data)
 
+    def _schedule_write(self) -> None:
+        # A burst of toggles from the Web UI becomes one write of the final state.
+        self._dirty = True
+        if self._write_task is None or self._write_task.done():
+            self._write_task = asyncio.create_task(self._write_later())
+
+    async def _write_later(self) -> None:
+        # Loop so updates that land while a write is in flight aren't left pending.
+        while self._dirty:
+            await asyncio.sleep(WRITE_DELAY)
+            try:
+                await self._write_pending()
+            except Exception:
+                # The update already succeeded in memory; the next update or `flush` retries the write.
+                logger.exception("Failed to write settings file %s", self.path)
+                return
+
+    async def flush(self) -> None:
+        """Write pending updates now, raising if the write fails."""
+        task = self._write_task
+        if task is not None and not task.done():
+            # Let an in-flight delayed write finish first; it logs its own errors.
+            await asyncio.wait([task])
+        await self._write_pending()
+
+    async def _write_pending(self) -> None:
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            # `update` replaces `_data` rather than mutating it, so this snapshot is stable.
+            await self._write_now(self._data)
+        except BaseException:
+            self._dirty = True
+            raise
+
+    async def _write_now(self, data: Dict[str, Any]) -> None:
+        async with self._write_lock:
+            await asyncio.to_thread(self._write_file, data)
+
     def _read_file(self) -> Optional[Dict[str, Any]]:
         try:
+            if orjson is not None:
+                with open(self.path, "rb") as f:
+                    return orjson.loads(f.read())
             with open(self.path, "r", encoding="utf-8") as f:
                 return json.load(f)
         except FileNotFoundError:
             return None
-        except json.JSONDecodeError:
+        except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it.
             # Start fresh if file is corrupt.
             return None
 
     def _write_file(self, data: Dict[str, Any]) -> None:
         os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
         tmp_path = f"{self.path}.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        if orjson is not None:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
         os.replace(tmp_path, self.path)
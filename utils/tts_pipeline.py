@@ -1,10 +1,12 @@
 import asyncio
-import base64
+import binascii
+import contextlib
 import json
 import queue
+import re
 import time
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Union
 
 import aiohttp
 
@@ -55,7 +57,14 @@ circuit_breakers = {
     "google": CircuitBreaker("Google", failure_threshold=5, reset_timeout=30),
 }
 
-failed_voices: dict[str, dict] = {}
+
+@dataclass(slots=True)
+class VoiceStatus:
+    failures: int = 0
+    cooldown_until: float = 0.0
+
+
+failed_voices: dict[str, VoiceStatus] = {}
 
 _shared_session: Optional[aiohttp.ClientSession] = None
 
@@ -64,7 +73,13 @@ def _get_session() -> aiohttp.ClientSession:
     global _shared_session
     if _shared_session is None or _shared_session.closed:
         timeout = aiohttp.ClientTimeout(total=TTS_HTTP_TIMEOUT)
-        _shared_session = aiohttp.ClientSession(timeout=timeout, headers={"User-Agent": USER_AGENT})
+        # Only two TTS hosts are ever hit; keep their lookups well past aiohttp's 10s default.
+        connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+        _shared_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={"User-Agent": USER_AGENT},
+        )
     return _shared_session
 
 
@@ -76,38 +91,37 @@ async def close_session() -> None:
 
 
 def mark_voice_failed(voice_id: str) -> None:
-    now = time.monotonic()
-    status = failed_voices.get(voice_id, {"failures": 0, "cooldown_until": 0.0})
-    status["failures"] += 1
-    if status["failures"] >= VOICE_FAILURE_THRESHOLD:
-        status["cooldown_until"] = now + VOICE_COOLDOWN_DURATION
-    failed_voices[voice_id] = status
+    status = failed_voices.get(voice_id)
+    if status is None:
+        status = failed_voices[voice_id] = VoiceStatus()
+    status.failures += 1
+    if status.failures >= VOICE_FAILURE_THRESHOLD:
+        status.cooldown_until = time.monotonic() + VOICE_COOLDOWN_DURATION
 
 
 def mark_voice_success(voice_id: str) -> None:
     status = failed_voices.get(voice_id)
-    if not status:
+    if status is None:
         return
-    status["failures"] = max(0, status["failures"] - 1)
-    if status["failures"] == 0:
-        status["cooldown_until"] = 0.0
+    status.failures = max(0, status.failures - 1)
+    if status.failures == 0:
+        status.cooldown_until = 0.0
 
 
 def is_voice_available(voice_id: str) -> bool:
     status = failed_voices.get(voice_id)
-    if not status:
+    if status is None:
         return True
-    now = time.monotonic()
-    if status["cooldown_until"] and now >= status["cooldown_until"]:
-        status["failures"] = 0
-        status["cooldown_until"] = 0.0
-        failed_voices[voice_id] = status
+    if status.cooldown_until and time.monotonic() >= status.cooldown_until:
+        status.failures = 0
+        status.cooldown_until = 0.0
         return True
-    return status["failures"] < VOICE_FAILURE_THRESHOLD
+    return status.failures < VOICE_FAILURE_THRESHOLD
 
 
 def is_google_voice(voice_id: str) -> bool:
-    return voice_id == "google_translate" or voice_id.startswith("google_")
+    # "google_translate" and any other Google-backed id share the prefix.
+    return voice_id.startswith("google_")
 
 
 async def retry_with_backoff(func, max_retries: int = 2, base_delay: float = 0.5):
@@ -122,9 +136,13 @@ async def retry_with_backoff(func, max_retries: int = 2, base_delay: float = 0.5
 
 @dataclass
 class QueueStream:
-    queue: queue.Queue
+    # Fed on the event loop, read by FFmpeg's stdin writer thread. SimpleQueue is
+    # enough for one producer and one consumer and skips Queue's Condition bookkeeping.
+    queue: "queue.SimpleQueue[Optional[bytes]]"
     buffer: bytearray
     closed: bool = False
+    # Bytes of `buffer` before this offset were already returned by `read`.
+    read_pos: int = field(default=0, init=False, repr=False)
 
     def feed(self, data: bytes) -> None:
         self.queue.put(data)
@@ -138,58 +156,124 @@ class QueueStream:
         if size < 0:
             size = 65536
 
-        while len(self.buffer) < size and not self.closed:
-            chunk = self.queue.get()
+        buf = self.buffer
+        while len(buf) - self.read_pos < size and not self.closed:
+            # Block only while there is nothing to return; otherwise take what is
+            # already queued and hand back a short read rather than wait on the network.
+            if len(buf) > self.read_pos:
+                try:
+                    chunk = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            else:
+                chunk = self.queue.get()
             if chunk is None:
                 self.closed = True
                 break
-            self.buffer.extend(chunk)
+            buf.extend(chunk)
 
-        if not self.buffer:
+        start = self.read_pos
+        end = min(start + size, len(buf))
+        if start >= end:
             return b""
 
-        data = bytes(self.buffer[:size])
-        del self.buffer[:size]
+        data = bytes(memoryview(buf)[start:end])
+        # Advance an offset instead of deleting from the front on every read;
+        # compact once the consumed prefix outweighs what is left.
+        if end == len(buf):
+            buf.clear()
+            self.read_pos = 0
+        elif end > len(buf) // 2:
+            del buf[:end]
+            self.read_pos = 0
+        else:
+            self.read_pos = end
         return data
 
 
-def _json_find_string_value_start(buf: bytes, key: bytes) -> Optional[int]:
-    """Best-effort JSON key lookup that returns the index *after* the opening quote.
+class AsyncQueueStream:
+    """QueueStream counterpart for event-loop consumers: `async for chunk in stream`.
 
-    We only need enough parsing to locate `"data":"<base64...>"` in a minified response.
+    Chunks already queued are joined up to `chunk_size` per iteration. Iteration
+    re-raises the producer's error once the stream ends; `aclose()` cancels it.
     """
 
-    key_idx = buf.find(key)
-    if key_idx < 0:
-        return None
+    def __init__(self, chunk_size: int = 16 * 1024) -> None:
+        self.chunk_size = chunk_size
+        self.producer_task: Optional[asyncio.Task] = None
+        # The voice actually producing the audio; differs from the request after a fallback.
+        self.voice_id: Optional[str] = None
+        self._queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+        self._done = False
 
-    i = key_idx + len(key)
-    n = len(buf)
-
-    # Skip whitespace
-    while i < n and buf[i] in b" \t\r\n":
-        i += 1
-    if i >= n or buf[i] != 58:  # ':'
-        return None
-    i += 1
+    def feed(self, data: bytes) -> None:
+        self._queue.put_nowait(data)
 
-    while i < n and buf[i] in b" \t\r\n":
-        i += 1
-    if i >= n:
-        return None
+    def close(self) -> None:
+        self._queue.put_nowait(None)
+
+    def __aiter__(self) -> "AsyncQueueStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if not self._done:
+            chunk = await self._queue.get()
+            if chunk is not None:
+                if self._queue.empty() or len(chunk) >= self.chunk_size:
+                    return chunk
+                buf = bytearray(chunk)
+                while len(buf) < self.chunk_size and not self._queue.empty():
+                    more = self._queue.get_nowait()
+                    if more is None:
+                        self._done = True
+                        break
+                    buf += more
+                return bytes(buf)
+            self._done = True
+
+        if self.producer_task is not None:
+            task, self.producer_task = self.producer_task, None
+            await task
+        raise StopAsyncIteration
+
+    async def aclose(self) -> None:
+        task, self.producer_task = self.producer_task, None
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        await asyncio.wait([task])
+        if not task.cancelled():
+            with contextlib.suppress(Exception):
+                task.result()
+
+
+_StreamSink = Union[QueueStream, AsyncQueueStream]
+
+
+# `"data"`, a colon and the start of its value, with JSON whitespace in between.
+_DATA_VALUE_RE = re.compile(rb'"data"[ \t\r\n]*:[ \t\r\n]*(?:"|null)')
+
+
+def _find_data_value_start(buf: bytes) -> Optional[int]:
+    """Return the index *after* the opening quote of the `data` string, -1 for null.
+
+    We only need enough parsing to locate `"data":"<base64...>"` in a minified response;
+    None means the value has not arrived (yet).
+    """
 
-    if buf[i] == 110 and buf[i : i + 4] == b"null":  # 'n'
-        return -1
-    if buf[i] != 34:  # '"'
+    m = _DATA_VALUE_RE.search(buf)
+    if m is None:
         return None
-    return i + 1
+    end = m.end()
+    return end if buf[end - 1] == 34 else -1  # '"'
 
 
 async def _decode_tiktok_json_base64_stream(
     resp: aiohttp.ClientResponse,
     *,
     voice_id: str,
-    stream: QueueStream,
+    stream: _StreamSink,
 ) -> None:
     """Stream-decode the `"data":"<base64...>"` field and feed bytes into QueueStream."""
 
@@ -213,9 +297,9 @@ async def _decode_tiktok_json_base64_stream(
         nonlocal b64_buf
         end_quote = data.find(b"\"")
         if end_quote != -1:
-            b64_buf.extend(data[:end_quote])
+            b64_buf.extend(memoryview(data)[:end_quote])
             try:
-                feed_decoded(base64.b64decode(bytes(b64_buf)))
+                feed_decoded(binascii.a2b_base64(b64_buf))
             except Exception as exc:
                 raise TTSAPIError(f"Invalid TikTok base64: {exc}", voice_id) from exc
             b64_buf.clear()
@@ -225,12 +309,15 @@ async def _decode_tiktok_json_base64_stream(
         # Decode only full 4-char base64 quanta to keep streaming.
         decode_len = (len(b64_buf) // 4) * 4
         if decode_len >= 4:
-            chunk = bytes(b64_buf[:decode_len])
-            del b64_buf[:decode_len]
             try:
-                feed_decoded(base64.b64decode(chunk))
+                # a2b_base64 reads the view without copying it; the view is released before the resize.
+                with memoryview(b64_buf) as view:
+                    decoded = binascii.a2b_base64(view[:decode_len])
             except Exception as exc:
                 raise TTSAPIError(f"Invalid TikTok base64: {exc}", voice_id) from exc
+            # At most three bytes remain, so this never shifts a long tail.
+            del b64_buf[:decode_len]
+            feed_decoded(decoded)
         return False
 
     async for chunk in resp.content.iter_chunked(4096):
@@ -240,7 +327,7 @@ async def _decode_tiktok_json_base64_stream(
                 # `data` should be near the start; avoid buffering huge responses on parse failure.
                 raise TTSAPIError("TikTok JSON parse error (data field not found)", voice_id)
 
-            start = _json_find_string_value_start(prefix, b"\"data\"")
+            start = _find_data_value_start(prefix)
             if start is None:
                 continue
             if start == -1:
@@ -273,7 +360,7 @@ async def _decode_tiktok_json_base64_stream(
     # Flush any remaining base64 (should only happen if the stream ends unexpectedly).
     if b64_buf:
         try:
-            feed_decoded(base64.b64decode(bytes(b64_buf)))
+            feed_decoded(binascii.a2b_base64(b64_buf))
         except Exception as exc:
             raise TTSAPIError(f"Invalid TikTok base64: {exc}", voice_id) from exc
         b64_buf.clear()
@@ -282,7 +369,7 @@ async def _decode_tiktok_json_base64_stream(
         raise TTSAPIError("TikTok returned empty audio data", voice_id)
 
 
-async def _open_google_stream(text: str, voice_id: str, stream: QueueStream) -> asyncio.Task:
+async def _open_google_stream(text: str, voice_id: str, stream: _StreamSink) -> asyncio.Task:
     params = {"ie": "UTF-8", "q": text, "tl": "en", "client": "tw-ob"}
 
     session = _get_session()
@@ -303,7 +390,7 @@ async def _open_google_stream(text: str, voice_id: str, stream: QueueStream) ->
     return asyncio.create_task(producer())
 
 
-async def _open_tiktok_stream(text: str, voice_id: str, stream: QueueStream) -> asyncio.Task:
+async def _open_tiktok_stream(text: str, voice_id: str, stream: _StreamSink) -> asyncio.Task:
     headers = {"User-Agent": USER_AGENT}
     url = TIKTOK_TTS_URL
     payload = {"text": text, "voice": voice_id}
@@ -363,8 +450,28 @@ async def get_tts_stream(
     *,
     fallback_voice: str = FALLBACK_VOICE,
 ) -> Tuple[QueueStream, asyncio.Task]:
-    stream = QueueStream(queue=queue.Queue(), buffer=bytearray())
+    stream = QueueStream(queue=queue.SimpleQueue(), buffer=bytearray())
+    producer_task, _voice = await _start_producer(text, voice_id, fallback_voice, stream)
+    return stream, producer_task
+
 
+async def get_tts_stream_async(
+    text: str,
+    voice_id: str,
+    *,
+    fallback_voice: str = FALLBACK_VOICE,
+    chunk_size: int = 16 * 1024,
+) -> AsyncQueueStream:
+    """Like `get_tts_stream`, but the audio is consumed with `async for` and no threads."""
+    stream = AsyncQueueStream(chunk_size)
+    stream.producer_task, stream.voice_id = await _start_producer(text, voice_id, fallback_voice, stream)
+    return stream
+
+
+async def _start_producer(
+    text: str, voice_id: str, fallback_voice: str, stream: _StreamSink
+) -> Tuple[asyncio.Task, str]:
+    """Start the audio producer; returns it with the voice that ended up serving the request."""
     requested_voice = voice_id or fallback_voice
     if not is_voice_available(requested_voice):
         requested_voice = fallback_voice
@@ -379,14 +486,14 @@ async def get_tts_stream(
 
     try:
         producer_task = await breaker.execute(lambda: retry_with_backoff(start))
-        return stream, producer_task
+        return producer_task, requested_voice
     except Exception as primary_error:
         if not requested_is_google:
             try:
                 producer_task = await circuit_breakers["google"].execute(
                     lambda: _open_google_stream(text, "google_translate", stream)
                 )
-                return stream, producer_task
+                return producer_task, "google_translate"
             except Exception:
                 pass
 
@@ -396,7 +503,7 @@ async def get_tts_stream(
                 producer_task = await retry_with_backoff(
                     lambda _: _open_tiktok_stream(text, fallback_voice, stream)
                 )
-                return stream, producer_task
+                return producer_task, fallback_voice
             except Exception:
                 pass
 
@@ -4,6 +4,9 @@ from typing import Iterable
 import discord
 
 
+_MENTION_RE = re.compile(r"<(@[!&]?|#)(\d+)>")
+
+
 def _safe_space(text: str) -> str:
     return " ".join((text or "").split())
 
@@ -14,26 +17,24 @@ def _iter_tokens(prefix: str, ids: Iterable[int]) -> list[str]:
 
 def normalize_mentions(message: discord.Message) -> str:
     text = message.content or ""
+    if "<" not in text:
+        return _safe_space(text)
 
-    replacements: dict[str, str] = {}
-
+    # One lookup keyed like the markup itself ("@id", "@&id", "#id"); "<@!id>" is folded into "@id".
+    names: dict[str, str] = {}
     for member in message.mentions:
         name = member.display_name if isinstance(member, discord.Member) else getattr(member, "name", str(member.id))
-        replacements[f"<@{member.id}>"] = f"@{name}"
-        replacements[f"<@!{member.id}>"] = f"@{name}"
-
+        names[f"@{member.id}"] = f"@{name}"
     for role in message.role_mentions:
-        replacements[f"<@&{role.id}>"] = f"@{role.name}"
-
+        names[f"@&{role.id}"] = f"@{role.name}"
     for channel in message.channel_mentions:
-        replacements[f"<#{channel.id}>"] = f"#{channel.name}"
+        names[f"#{channel.id}"] = f"#{channel.name}"
 
-    for token, repl in replacements.items():
-        if token in text:
-            text = text.replace(token, repl)
+    def _replace(match: re.Match) -> str:
+        kind = match.group(1)
+        if kind == "@!":
+            kind = "@"
+        # Mentions that are not resolved on the message are dropped.
+        return names.get(kind + match.group(2), "")
 
-    # Remove any leftover mention markup.
-    text = re.sub(r"<@!?\d+>", "", text)
-    text = re.sub(r"<@&\d+>", "", text)
-    text = re.sub(r"<#\d+>", "", text)
-    return _safe_space(text)
+    return _safe_space(_MENTION_RE.sub(_replace, text))